@@ -0,0 +1,171 @@
+"""
+Streaming record parsing for the GigM8 bulk ingest endpoint.
+
+Request bodies are parsed incrementally as they arrive, either as NDJSON (one
+JSON object per line) or as a single JSON array, so a feed of tens of
+thousands of listings never has to be held in memory at once.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, Tuple
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Largest single array element buffered while waiting for the rest of it
+MAX_ELEMENT_CHARS = 1_000_000
+
+JSON_WHITESPACE = " \t\r\n"
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+class RecordError(ValueError):
+    """A record in the request body could not be parsed."""
+
+
+def is_ndjson(content_type: str) -> bool:
+    """Whether the Content-Type announces newline-delimited JSON."""
+    return (content_type or "").split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (index, record) per non-empty line; record is a RecordError when unparsable.
+
+    A line longer than MAX_ELEMENT_CHARS bytes is reported as a RecordError
+    and skipped up to its newline, without being buffered.
+    """
+    index = 0
+    pending = bytearray()
+    oversized = False
+
+    def parse(line: bytes):
+        if oversized:
+            return RecordError(f"Line is larger than {MAX_ELEMENT_CHARS} bytes")
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return RecordError(f"Invalid JSON: {str(e)}")
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            end = len(chunk) if newline < 0 else newline
+            if not oversized:
+                pending += chunk[start:end]
+                if len(pending) > MAX_ELEMENT_CHARS:
+                    oversized = True
+                    pending.clear()
+            if newline < 0:
+                break
+            if oversized or pending.strip():
+                yield index, parse(bytes(pending))
+                index += 1
+            pending.clear()
+            oversized = False
+            start = newline + 1
+
+    if oversized or pending.strip():
+        yield index, parse(bytes(pending))
+
+
+def runs_to_end_as_number(buffer: str, position: int) -> bool:
+    """Whether everything from `position` to the end of `buffer` could be the rest of a number."""
+    return all(char in NUMBER_CHARS for char in buffer[position:])
+
+
+def may_continue(buffer: str, error: json.JSONDecodeError) -> bool:
+    """Whether a decode error could be caused by the element being cut off at the end of `buffer`."""
+    if error.pos >= len(buffer) or error.msg.startswith("Unterminated string"):
+        return True
+    tail = buffer[error.pos:]
+    if runs_to_end_as_number(buffer, error.pos):
+        # A number split after its "." or exponent, e.g. `1.` + `5`
+        return True
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        return len(tail) < 6
+    # A literal split across chunks, e.g. `tru` + `e`
+    return error.msg.startswith("Expecting value") and any(
+        literal.startswith(tail) for literal in ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+    )
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (index, record) for each element of a top-level JSON array.
+
+    Raises RecordError as soon as an element is malformed, empty (`[,{...}]`)
+    or larger than MAX_ELEMENT_CHARS, so a bad body never buffers past one
+    element.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    index = 0
+    started = False
+    expect_value = True  # after "[" or ","; otherwise after an element
+    eof = False
+    chunk_iter = chunks.__aiter__()
+
+    async def read_more() -> bool:
+        nonlocal buffer, position, eof
+        try:
+            chunk = await chunk_iter.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            return False
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                raise RecordError("Unexpected end of JSON array")
+            await read_more()
+            continue
+
+        char = buffer[position]
+        if not started:
+            if char != "[":
+                raise RecordError("Request body must be a JSON array or NDJSON")
+            started = True
+            position += 1
+            continue
+
+        if not expect_value:
+            if char == "]":
+                return
+            if char != ",":
+                raise RecordError(f"Expected ',' or ']' after element {index - 1}")
+            expect_value = True
+            position += 1
+            continue
+
+        if char == "]" and index == 0:
+            return
+        if char in ",]":
+            raise RecordError(f"Empty element at position {index}")
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # Only an element cut off by the end of the buffer is worth more data
+            if eof or not may_continue(buffer, e):
+                raise RecordError(f"Invalid JSON at element {index}: {e.msg}")
+            if len(buffer) - position > MAX_ELEMENT_CHARS:
+                raise RecordError(f"Element {index} is larger than {MAX_ELEMENT_CHARS} characters")
+            await read_more()
+            continue
+
+        if not eof and isinstance(record, (int, float)) and runs_to_end_as_number(buffer, end):
+            # A number at the end of the buffer may continue in the next chunk
+            await read_more()
+            continue
+
+        yield index, record
+        index += 1
+        position = end
+        expect_value = False
@@ -0,0 +1,207 @@
+"""
+Search result cache for GigM8 job aggregator.
+
+Two tiers: an in-process LRU in front of Redis. Every key embeds a global
+generation number that writers bump after changing jobs, so a bump makes all
+earlier entries unreachable without having to find and delete them.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from models.database import settings
+
+logger = logging.getLogger(__name__)
+
+# Filters whose SQL predicates are case-insensitive, so their cache keys can be too
+CASE_INSENSITIVE_PARAMS = {"query", "location", "company", "industry"}
+
+
+class SearchCache:
+    """LRU + Redis cache for encoded job listing response bodies."""
+
+    GENERATION_KEY = "gigm8:jobs:generation"
+    KEY_PREFIX = "gigm8:search"
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int = 300,
+        local_ttl: int = 30,
+        max_entries: int = 512,
+        generation_ttl: float = 1.0,
+        retry_after: float = 30.0
+    ):
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self.generation_ttl = generation_ttl
+        self.retry_after = retry_after
+
+        self._local: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._redis_down_until = 0.0
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0, "invalidations": 0}
+
+    @classmethod
+    def from_settings(cls) -> "SearchCache":
+        """Create a cache configured from application settings."""
+        return cls(
+            redis_url=settings.redis_url,
+            ttl=settings.search_cache_ttl,
+            local_ttl=settings.search_cache_local_ttl,
+            max_entries=settings.search_cache_size,
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Build a cache key from normalized request parameters."""
+        normalized = {}
+        for name, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, Enum):
+                value = value.value
+            if isinstance(value, str):
+                value = value.strip()
+                if name in CASE_INSENSITIVE_PARAMS:
+                    value = value.lower()
+            normalized[name] = value
+
+        raw = json.dumps([endpoint, normalized], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a cached response body, or None on a miss."""
+        generation = self._current_generation()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                expires_at, entry_generation, value = entry
+                if expires_at >= now and entry_generation == generation:
+                    self._local.move_to_end(key)
+                    self._stats["local_hits"] += 1
+                    return value
+                del self._local[key]
+
+        client = self._client()
+        if client is not None:
+            try:
+                value = client.get(self._redis_key(generation, key))
+                if value is not None:
+                    self._store_local(key, generation, value)
+                    with self._lock:
+                        self._stats["redis_hits"] += 1
+                    return value
+            except redis.RedisError as e:
+                self._mark_down(e)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a response body in both tiers."""
+        generation = self._current_generation()
+        self._store_local(key, generation, value)
+
+        client = self._client()
+        if client is not None:
+            try:
+                client.set(self._redis_key(generation, key), value, ex=self.ttl)
+            except redis.RedisError as e:
+                self._mark_down(e)
+
+        with self._lock:
+            self._stats["sets"] += 1
+
+    def bump_generation(self) -> None:
+        """Invalidate every cached response; called by writers after changing jobs."""
+        client = self._client()
+        generation = None
+        if client is not None:
+            try:
+                generation = int(client.incr(self.GENERATION_KEY))
+            except redis.RedisError as e:
+                self._mark_down(e)
+
+        with self._lock:
+            self._generation = generation if generation is not None else self._generation + 1
+            self._generation_checked_at = time.monotonic()
+            self._local.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and sizes for TTL tuning."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+            stats["generation"] = self._generation
+
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+        stats["ttl"] = self.ttl
+        stats["local_ttl"] = self.local_ttl
+        return stats
+
+    def _current_generation(self) -> int:
+        """Return the global generation, re-reading Redis at most every generation_ttl seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._generation_checked_at < self.generation_ttl:
+                return self._generation
+
+        client = self._client()
+        if client is not None:
+            try:
+                raw = client.get(self.GENERATION_KEY)
+                with self._lock:
+                    self._generation = int(raw) if raw is not None else 0
+            except redis.RedisError as e:
+                self._mark_down(e)
+
+        with self._lock:
+            self._generation_checked_at = now
+            return self._generation
+
+    def _store_local(self, key: str, generation: int, value: bytes) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, generation, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _redis_key(self, generation: int, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{generation}:{key}"
+
+    def _client(self) -> Optional[redis.Redis]:
+        """Return the Redis client, or None while Redis is considered down."""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._redis
+
+    def _mark_down(self, error: Exception) -> None:
+        logger.warning(f"Search cache Redis unavailable, using local tier only: {str(error)}")
+        self._redis_down_until = time.monotonic() + self.retry_after
+
+
+search_cache = SearchCache.from_settings()
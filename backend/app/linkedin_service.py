@@ -9,6 +9,8 @@ import logging
 import os
 from typing import List, Dict, Any, Optional
 
+from app.salary import parse_salary
+
 logger = logging.getLogger(__name__)
 
 class LinkedInJobsService:
@@ -136,29 +138,13 @@ linkedIn.query(queryOptions)
     
     def _parse_salary(self, salary_str: str) -> Optional[Dict[str, Any]]:
         """Parse salary string into structured format"""
-        if not salary_str or salary_str.strip() == "":
+        parsed = parse_salary(salary_str)
+        if not parsed:
             return None
         
-        # Simple salary parsing - can be enhanced
-        try:
-            # Look for salary ranges like "$50,000 - $80,000"
-            import re
-            numbers = re.findall(r'[\d,]+', salary_str.replace('$', '').replace(',', ''))
-            if len(numbers) >= 2:
-                return {
-                    "min": int(numbers[0]),
-                    "max": int(numbers[1]),
-                    "currency": "USD",
-                    "period": "year"
-                }
-            elif len(numbers) == 1:
-                return {
-                    "min": int(numbers[0]),
-                    "max": int(numbers[0]),
-                    "currency": "USD",
-                    "period": "year"
-                }
-        except:
-            pass
-        
-        return None
+        return {
+            "min": parsed.min_annual,
+            "max": parsed.max_annual,
+            "currency": parsed.currency,
+            "period": "year"
+        }
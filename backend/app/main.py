@@ -1,19 +1,25 @@
 """
 FastAPI application for GigM8 job aggregator.
 """
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import and_, or_, desc, asc
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from pydantic import ValidationError
 import logging
 
-from models.database import get_db, settings
+from models.database import get_db, get_async_db, settings
 from models.job import Job
-from app.schemas import JobResponse, JobCreate, JobSearch, PaginatedResponse
-from app.services import JobService
+from app.schemas import JobResponse, JobCreate, JobSearch, PaginatedResponse, CountMode
+from app.services import JobService, AsyncJobService, InvalidCursorError, InvalidFieldsError, InvalidSortError, resolve_fields
+from app.cache import search_cache
+from app.serialization import render_page, json_body_response
+from app.bulk import RecordError, is_ndjson, iter_ndjson, iter_json_array
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,8 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize job service
+# Initialize job services (async for reads, sync for writes)
 job_service = JobService()
+async_job_service = AsyncJobService(job_service)
 
 @app.get("/", response_model=Dict[str, str])
 async def root():
@@ -55,38 +62,63 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """Search cache hit/miss counters."""
+    return search_cache.stats()
+
 @app.get("/jobs", response_model=PaginatedResponse)
 async def get_jobs(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Number of jobs per page"),
-    sort_by: str = Query("created_at", description="Sort field"),
+    sort_by: str = Query("created_at", description="Sort field: id, created_at, updated_at, date_posted, title, company, salary_min_annual or salary_max_annual"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
+    count_mode: CountMode = Query(CountMode.ESTIMATED, description="How to compute total (exact/capped/estimated/cached)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'summary' (default) / 'full'"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated list of jobs."""
     try:
-        jobs, total = job_service.get_jobs(
+        cache_key = search_cache.make_key("jobs", {
+            "page": page, "size": size, "sort_by": sort_by, "sort_order": sort_order,
+            "cursor": cursor, "count_mode": count_mode, "fields": fields or "summary"
+        })
+        cached = await run_in_threadpool(search_cache.get, cache_key)
+        if cached is not None:
+            return json_body_response(cached)
+        
+        jobs, total, total_exact = await async_job_service.get_jobs(
             db=db,
             page=page,
             size=size,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            cursor=cursor,
+            count_mode=count_mode,
+            columns=resolve_fields(fields)
         )
         
-        return PaginatedResponse(
-            items=[job.to_dict() for job in jobs],
+        body = render_page(
+            jobs,
             total=total,
             page=page,
             size=size,
-            pages=(total + size - 1) // size
+            next_cursor=job_service.next_cursor(jobs, size, sort_by, sort_order),
+            count_mode=count_mode,
+            total_exact=total_exact
         )
+        await run_in_threadpool(search_cache.set, cache_key, body)
+        return json_body_response(body)
+    except (InvalidCursorError, InvalidFieldsError, InvalidSortError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching jobs: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/jobs/search", response_model=PaginatedResponse)
 async def search_jobs(
-    query: Optional[str] = Query(None, description="Search query"),
+    query: Optional[str] = Query(None, description="Search query (web search syntax: quotes, OR, -exclude)"),
     location: Optional[str] = Query(None, description="Location filter"),
     company: Optional[str] = Query(None, description="Company filter"),
     source: Optional[str] = Query(None, description="Source filter"),
@@ -100,9 +132,12 @@ async def search_jobs(
     date_to: Optional[datetime] = Query(None, description="Jobs posted to date"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Number of jobs per page"),
-    sort_by: str = Query("created_at", description="Sort field"),
+    sort_by: str = Query("created_at", description="Sort field (as for /jobs), or 'relevance' to rank by text match"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
+    count_mode: CountMode = Query(CountMode.CAPPED, description="How to compute total (exact/capped/estimated/cached)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'summary' (default) / 'full'"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search jobs with various filters."""
     try:
@@ -121,31 +156,88 @@ async def search_jobs(
             date_to=date_to
         )
         
-        jobs, total = job_service.search_jobs(
+        cache_key = search_cache.make_key("jobs/search", {
+            **search_params.model_dump(),
+            "page": page, "size": size, "sort_by": sort_by, "sort_order": sort_order,
+            "cursor": cursor, "count_mode": count_mode, "fields": fields or "summary"
+        })
+        cached = await run_in_threadpool(search_cache.get, cache_key)
+        if cached is not None:
+            return json_body_response(cached)
+        
+        jobs, total, total_exact = await async_job_service.search_jobs(
             db=db,
             search_params=search_params,
             page=page,
             size=size,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            cursor=cursor,
+            count_mode=count_mode,
+            columns=resolve_fields(fields)
         )
         
-        return PaginatedResponse(
-            items=[job.to_dict() for job in jobs],
+        body = render_page(
+            jobs,
             total=total,
             page=page,
             size=size,
-            pages=(total + size - 1) // size
+            next_cursor=job_service.next_cursor(jobs, size, sort_by, sort_order),
+            count_mode=count_mode,
+            total_exact=total_exact
         )
+        await run_in_threadpool(search_cache.set, cache_key, body)
+        return json_body_response(body)
+    except (InvalidCursorError, InvalidFieldsError, InvalidSortError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching jobs: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.get("/jobs/locations/suggest", response_model=List[Dict[str, Any]])
+async def suggest_locations(
+    q: str = Query(..., min_length=2, description="Location as typed by the user"),
+    limit: int = Query(5, ge=1, le=20, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Suggest known locations ranked by trigram similarity ("did you mean")."""
+    try:
+        return await async_job_service.suggest_locations(db=db, term=q, limit=limit)
+    except Exception as e:
+        logger.error(f"Error suggesting locations: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/jobs/stats", response_model=Dict[str, Any])
+async def get_job_stats(
+    fresh: bool = Query(False, description="Compute live instead of serving the latest snapshot"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get job statistics."""
+    try:
+        stats = await async_job_service.get_job_stats(db=db, fresh=fresh)
+        return stats
+    except Exception as e:
+        logger.error(f"Error fetching job stats: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/jobs/sources", response_model=List[Dict[str, Any]])
+async def get_job_sources(
+    fresh: bool = Query(False, description="Compute live instead of serving the latest snapshot"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get list of job sources and their counts."""
+    try:
+        sources = await async_job_service.get_job_sources(db=db, fresh=fresh)
+        return sources
+    except Exception as e:
+        logger.error(f"Error fetching job sources: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.get("/jobs/{job_id}", response_model=JobResponse)
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job by ID."""
     try:
-        job = job_service.get_job_by_id(db=db, job_id=job_id)
+        job = await async_job_service.get_job_by_id(db=db, job_id=job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -157,7 +249,7 @@ async def get_job(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
+def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     """Create a new job listing (for manual entry by employers)."""
     try:
         job = job_service.create_job(db=db, job_data=job_data)
@@ -166,8 +258,85 @@ async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
         logger.error(f"Error creating job: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/jobs/bulk")
+async def bulk_ingest_jobs(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000, description="Jobs per upsert batch"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream a feed of job listings into the database.
+    
+    The body is either NDJSON (Content-Type: application/x-ndjson, one job per
+    line) or a JSON array of jobs. Records are parsed as they arrive and
+    upserted on their job hash in batches of `batch_size`; invalid records are
+    reported by position instead of failing the whole request.
+    """
+    records = iter_ndjson if is_ndjson(request.headers.get("content-type")) else iter_json_array
+    batches = []
+    rejected = []
+    pending = []
+    error = None
+    
+    async def flush():
+        summary = await async_job_service.bulk_upsert_jobs(db, pending)
+        if summary["inserted"] or summary["updated"]:
+            await run_in_threadpool(search_cache.bump_generation)
+        rejected.extend(summary["rejected"])
+        batches.append({
+            "first_index": pending[0][0],
+            "size": len(pending),
+            "inserted": summary["inserted"],
+            "updated": summary["updated"],
+            "unchanged": summary["unchanged"],
+            "duplicate": summary["duplicate"],
+            "rejected": len(summary["rejected"]),
+        })
+        pending.clear()
+    
+    try:
+        async for index, record in records(request.stream()):
+            if isinstance(record, RecordError):
+                rejected.append({"index": index, "reason": str(record)})
+                continue
+            try:
+                pending.append((index, JobCreate.model_validate(record)))
+            except ValidationError as e:
+                rejected.append({"index": index, "reason": "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}"
+                    for err in e.errors()
+                )})
+                continue
+            if len(pending) >= batch_size:
+                await flush()
+    except RecordError as e:
+        # Fatally malformed body: keep what was already ingested and report where it stopped
+        error = str(e)
+    except Exception as e:
+        logger.error(f"Error in bulk ingest: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    try:
+        if pending:
+            await flush()
+    except Exception as e:
+        logger.error(f"Error in bulk ingest: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    rejected.sort(key=lambda item: item["index"])
+    return {
+        "inserted": sum(batch["inserted"] for batch in batches),
+        "updated": sum(batch["updated"] for batch in batches),
+        "unchanged": sum(batch["unchanged"] for batch in batches),
+        "duplicate": sum(batch["duplicate"] for batch in batches),
+        "rejected": len(rejected),
+        "batches": batches,
+        "errors": rejected,
+        "error": error,
+    }
+
 @app.put("/jobs/{job_id}", response_model=JobResponse)
-async def update_job(job_id: int, job_data: JobCreate, db: Session = Depends(get_db)):
+def update_job(job_id: int, job_data: JobCreate, db: Session = Depends(get_db)):
     """Update an existing job listing."""
     try:
         job = job_service.update_job(db=db, job_id=job_id, job_data=job_data)
@@ -182,7 +351,7 @@ async def update_job(job_id: int, job_data: JobCreate, db: Session = Depends(get
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.delete("/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+def delete_job(job_id: int, db: Session = Depends(get_db)):
     """Delete a job listing."""
     try:
         success = job_service.delete_job(db=db, job_id=job_id)
@@ -194,26 +363,6 @@ async def delete_job(job_id: int, db: Session = Depends(get_db)):
         logger.error(f"Error deleting job {job_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/jobs/stats", response_model=Dict[str, Any])
-async def get_job_stats(db: Session = Depends(get_db)):
-    """Get job statistics."""
-    try:
-        stats = job_service.get_job_stats(db=db)
-        return stats
-    except Exception as e:
-        logger.error(f"Error fetching job stats: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-@app.get("/jobs/sources", response_model=List[Dict[str, Any]])
-async def get_job_sources(db: Session = Depends(get_db)):
-    """Get list of job sources and their counts."""
-    try:
-        sources = job_service.get_job_sources(db=db)
-        return sources
-    except Exception as e:
-        logger.error(f"Error fetching job sources: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
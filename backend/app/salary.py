@@ -0,0 +1,184 @@
+"""
+Salary parsing for GigM8 job aggregator.
+
+Turns free-form salary strings ("$120k - $160k", "£45,000 a year",
+"$38.50/hr") into a normalized annual range so salaries can be stored in
+numeric columns and filtered with an index range scan.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+# Working-time multipliers to annualize a pay rate
+PERIOD_MULTIPLIERS = {
+    "hour": 2080,
+    "day": 260,
+    "week": 52,
+    "month": 12,
+    "year": 1,
+}
+
+PERIOD_PATTERNS = [
+    ("hour", re.compile(r"\b(?:per\s+hour|an\s+hour|hourly|hour|hr)\b|/\s*h(?:ou)?r\b", re.I)),
+    ("day", re.compile(r"\b(?:per\s+day|a\s+day|daily|day)\b|/\s*day\b", re.I)),
+    ("week", re.compile(r"\b(?:per\s+week|a\s+week|weekly|week|wk)\b|/\s*wk\b", re.I)),
+    ("month", re.compile(r"\b(?:per\s+month|a\s+month|monthly|month|mo)\b|/\s*mo\b", re.I)),
+    ("year", re.compile(r"\b(?:per\s+year|a\s+year|annual(?:ly)?|year(?:ly)?|yr|p\.?a\.?)\b|/\s*yr\b", re.I)),
+]
+
+# Checked in order, so multi-character symbols come before "$"
+CURRENCY_SYMBOLS = [
+    ("C$", "CAD"),
+    ("CA$", "CAD"),
+    ("A$", "AUD"),
+    ("AU$", "AUD"),
+    ("€", "EUR"),
+    ("£", "GBP"),
+    ("₹", "INR"),
+    ("¥", "JPY"),
+    ("$", "USD"),
+]
+CURRENCY_CODES = {"USD", "CAD", "AUD", "EUR", "GBP", "INR", "JPY", "CHF", "SGD", "NZD"}
+
+# Grouped thousands ("120,000", "60.000", "1 000 000") with optional cents, or a plain number
+AMOUNT_PATTERN = re.compile(r"(\d{1,3}(?:[,.\s]\d{3})+(?:\.\d{1,2})?(?!\d)|\d+(?:\.\d+)?)\s*([kKmM])?\b")
+CENTS_PATTERN = re.compile(r"\.\d{1,2}$")
+
+# A currency symbol or code right next to an amount
+CURRENCY_MARKER = r"(?:[A-Z]{1,2}\$|[$€£₹¥]|\b[A-Z]{3}\b)"
+CURRENCY_BEFORE = re.compile(CURRENCY_MARKER + r"\s*$")
+CURRENCY_AFTER = re.compile(r"^\s*" + CURRENCY_MARKER)
+# What may sit between the two ends of a range ("$120k - $160k", "90 to 110k")
+RANGE_JOIN = re.compile(rf"^\s*{CURRENCY_MARKER}?\s*(?:-|–|—|(?i:to))\s*{CURRENCY_MARKER}?\s*$")
+
+# Annual amounts outside this band are treated as parse errors
+MIN_ANNUAL = 1000
+MAX_ANNUAL = 10_000_000
+
+
+@dataclass(frozen=True)
+class SalaryRange:
+    """Normalized salary range in annual amounts."""
+    min_annual: int
+    max_annual: int
+    currency: str
+    period: str
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Values for the Job salary columns."""
+        return {
+            "salary_min_annual": self.min_annual,
+            "salary_max_annual": self.max_annual,
+            "salary_currency": self.currency,
+        }
+
+
+EMPTY_SALARY_COLUMNS = {
+    "salary_min_annual": None,
+    "salary_max_annual": None,
+    "salary_currency": None,
+}
+
+
+def detect_currency(text: str, default: str = "USD") -> str:
+    """Detect the currency of a salary string."""
+    for code in re.findall(r"\b[A-Z]{3}\b", text.upper()):
+        if code in CURRENCY_CODES:
+            return code
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    return default
+
+
+def detect_period(text: str) -> Optional[str]:
+    """Detect the pay period of a salary string, or None if not stated."""
+    for period, pattern in PERIOD_PATTERNS:
+        if pattern.search(text):
+            return period
+    return None
+
+
+def parse_amounts(text: str) -> list:
+    """Extract numeric amounts, expanding k/m suffixes.
+
+    A k/m number only counts as an amount when it carries a currency marker
+    or is one end of a range, so "401k" in "401k, $90,000" is ignored. Once
+    any amount carries a currency marker, numbers without one only count as
+    the other end of a range with a marked amount ("40 hours" in
+    "$45/hour, 40 hours per week").
+    """
+    amounts = []
+    matches = list(AMOUNT_PATTERN.finditer(text))
+    marked = [_has_currency_marker(text, match) for match in matches]
+    for position, match in enumerate(matches):
+        number, suffix = match.groups(default="")
+        partners = _range_partners(text, matches, position)
+        if any(marked) and not marked[position] and not any(marked[partner] for partner in partners):
+            continue
+        if suffix and not (marked[position] or partners):
+            continue
+        cents = CENTS_PATTERN.search(number)
+        whole = number[:cents.start()] if cents else number
+        if re.search(r"[,.\s]\d{3}", whole):
+            whole = re.sub(r"[,.\s]", "", whole)
+        value = float(whole) + (float(cents.group()) if cents else 0.0)
+        if suffix.lower() == "k":
+            value *= 1_000
+        elif suffix.lower() == "m":
+            value *= 1_000_000
+        amounts.append(value)
+    return amounts
+
+
+def _has_currency_marker(text: str, match: re.Match) -> bool:
+    return bool(CURRENCY_BEFORE.search(text[:match.start()]) or CURRENCY_AFTER.search(text[match.end():]))
+
+
+def _range_partners(text: str, matches: list, position: int) -> list:
+    """Positions of the neighbouring amounts the amount at `position` forms a range with."""
+    partners = []
+    if position > 0 and RANGE_JOIN.match(text[matches[position - 1].end():matches[position].start()]):
+        partners.append(position - 1)
+    if position + 1 < len(matches) and RANGE_JOIN.match(text[matches[position].end():matches[position + 1].start()]):
+        partners.append(position + 1)
+    return partners
+
+
+def parse_salary(salary: Optional[str], default_currency: str = "USD") -> Optional[SalaryRange]:
+    """Parse a free-form salary string into an annual SalaryRange.
+
+    Returns None when no plausible amount can be found.
+    """
+    if not salary or not salary.strip():
+        return None
+
+    text = salary.strip()
+    amounts = [amount for amount in parse_amounts(text) if amount > 0][:2]
+    if not amounts:
+        return None
+
+    low, high = min(amounts), max(amounts)
+    period = detect_period(text)
+    if period is None:
+        # Small bare numbers are almost always hourly rates
+        period = "hour" if high < 500 else "year"
+
+    multiplier = PERIOD_MULTIPLIERS[period]
+    min_annual = int(round(low * multiplier))
+    max_annual = int(round(high * multiplier))
+    if min_annual < MIN_ANNUAL or max_annual > MAX_ANNUAL:
+        return None
+
+    return SalaryRange(
+        min_annual=min_annual,
+        max_annual=max_annual,
+        currency=detect_currency(text, default_currency),
+        period=period,
+    )
+
+
+def salary_columns(salary: Optional[str]) -> Dict[str, Any]:
+    """Values for the Job salary columns parsed from a salary string."""
+    parsed = parse_salary(salary)
+    return parsed.to_columns() if parsed else dict(EMPTY_SALARY_COLUMNS)
@@ -22,6 +22,13 @@ class ExperienceLevel(str, Enum):
     SENIOR = "senior"
     EXECUTIVE = "executive"
 
+class CountMode(str, Enum):
+    """Strategy used to compute the total of a paginated response."""
+    EXACT = "exact"
+    CAPPED = "capped"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
 class JobResponse(BaseModel):
     """Response schema for job data."""
     id: int
@@ -29,6 +36,9 @@ class JobResponse(BaseModel):
     company: str
     location: str
     salary: Optional[str] = None
+    salary_min_annual: Optional[int] = None
+    salary_max_annual: Optional[int] = None
+    salary_currency: Optional[str] = None
     description: Optional[str] = None
     apply_url: str
     source: str
@@ -107,6 +117,9 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
+    count_mode: CountMode = CountMode.EXACT
+    total_exact: bool = True  # False when total is a cap ("N+") or an estimate
 
 class JobStats(BaseModel):
     """Schema for job statistics."""
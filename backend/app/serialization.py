@@ -0,0 +1,51 @@
+"""
+Fast response serialization for GigM8 job listings.
+
+List endpoints select plain column rows and encode them with orjson straight
+into the response body, skipping Job.to_dict(), PaginatedResponse validation
+and FastAPI's jsonable_encoder pass. The JSON produced matches the
+PaginatedResponse schema.
+"""
+from typing import Any, Iterable, Optional
+
+import orjson
+from fastapi.responses import Response
+
+from app.schemas import CountMode
+
+# Label of the sort column when it is selected only so next_cursor can read
+# it (the client's fields= left it out); never part of the response items
+CURSOR_KEY_LABEL = "_cursor_key"
+
+
+def render_page(
+    rows: Iterable[Any],
+    total: int,
+    page: int,
+    size: int,
+    next_cursor: Optional[str],
+    count_mode: CountMode,
+    total_exact: bool
+) -> bytes:
+    """Encode a page of column rows as a PaginatedResponse JSON body."""
+    return orjson.dumps({
+        "items": [_item(row) for row in rows],
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size,
+        "next_cursor": next_cursor,
+        "count_mode": count_mode,
+        "total_exact": total_exact,
+    })
+
+
+def _item(row: Any) -> dict:
+    item = row._asdict()
+    item.pop(CURSOR_KEY_LABEL, None)
+    return item
+
+
+def json_body_response(body: bytes) -> Response:
+    """Wrap an already-encoded JSON body in a response."""
+    return Response(content=body, media_type="application/json")
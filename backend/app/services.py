@@ -1,51 +1,172 @@
 """
 Business logic services for GigM8 job aggregator.
 """
+import base64
+import json
 import logging
+import threading
+import time
 from typing import List, Tuple, Optional, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func, text
-from models.job import Job
-from app.schemas import JobCreate, JobSearch
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, desc, asc, func, text, tuple_, DateTime
+from models.job import Job, LIST_COLUMNS, SUMMARY_COLUMNS, SORT_COLUMNS
+from models.job_stats import JobStatsSnapshot
+from models.job_upsert import upsert_job_rows
+from models.database import settings
+from app.schemas import JobCreate, JobSearch, CountMode
+from app.cache import search_cache
+from app.salary import salary_columns
+from app.serialization import CURSOR_KEY_LABEL
 
 logger = logging.getLogger(__name__)
 
+# Text search configuration used to build Job.search_vector
+SEARCH_CONFIG = "english"
+
+# Pseudo sort field ordering search results by ts_rank
+RELEVANCE_SORT = "relevance"
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields= selection names unknown fields."""
+
+
+class InvalidSortError(ValueError):
+    """Raised when sort_by names a field the list endpoints cannot sort by."""
+
+
+# Named projections accepted by fields=
+FIELD_SETS = {
+    "summary": SUMMARY_COLUMNS,
+    "full": LIST_COLUMNS,
+}
+
+
+def resolve_fields(fields: Optional[str]) -> List[Any]:
+    """Turn a fields= value into the columns to select.
+    
+    Accepts a named projection ("summary", "full") or a comma-separated list
+    of field names; `id` is always included. Defaults to "summary".
+    """
+    fields = (fields or "summary").strip()
+    if fields in FIELD_SETS:
+        return FIELD_SETS[fields]
+    
+    available = {column.key: column for column in LIST_COLUMNS}
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    
+    names = set(requested) | {"id"}
+    return [column for column in LIST_COLUMNS if column.key in names]
+
+
+def contains_pattern(term: str) -> str:
+    """Build an ILIKE substring pattern, escaping user-supplied wildcards.
+    
+    The location/company/industry columns carry pg_trgm GIN indexes, which
+    serve '%term%' patterns; escaping keeps a stray '%' or '_' in the input
+    from widening the match.
+    """
+    escaped = term.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, job_id: int) -> str:
+    """Encode the sort key and id of the last row of a page into an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order.lower(), "k": value, "id": job_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+            raise ValueError("missing id")
+        return payload
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+
+class CountCache:
+    """Short-TTL memo of query totals keyed by the normalized filter set."""
+    
+    def __init__(self, ttl: int, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Any, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, total = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return total
+    
+    def set(self, key: Any, total: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, total)
+
 class JobService:
     """Service class for job-related operations."""
     
+    def __init__(self):
+        self.count_cache = CountCache(ttl=settings.count_cache_ttl)
+    
     def get_jobs(
         self,
         db: Session,
         page: int = 1,
         size: int = 20,
         sort_by: str = "created_at",
-        sort_order: str = "desc"
-    ) -> Tuple[List[Job], int]:
-        """Get paginated list of jobs."""
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        columns: Optional[List[Any]] = None
+    ) -> Tuple[List[Job], int, bool]:
+        """Get paginated list of jobs.
+        
+        Returns the page, the total and whether that total is exact. When
+        `columns` is given the page holds rows of just those columns instead
+        of Job objects.
+        """
         try:
-            # Calculate offset
-            offset = (page - 1) * size
-            
             # Build query
             query = db.query(Job).filter(Job.is_active == True)
             
-            # Apply sorting
-            if hasattr(Job, sort_by):
-                sort_column = getattr(Job, sort_by)
-                if sort_order.lower() == "desc":
-                    query = query.order_by(desc(sort_column))
-                else:
-                    query = query.order_by(asc(sort_column))
-            
             # Get total count
-            total = query.count()
+            total, total_exact = self._count(db, query, count_mode)
+            
+            if columns:
+                query = query.with_entities(*self._with_sort_column(columns, sort_by))
             
-            # Apply pagination
-            jobs = query.offset(offset).limit(size).all()
+            # Apply sorting and pagination
+            jobs = self._paginate(query, page, size, sort_by, sort_order, cursor)
             
-            return jobs, total
+            return jobs, total, total_exact
             
+        except (InvalidCursorError, InvalidSortError):
+            raise
         except Exception as e:
             logger.error(f"Error fetching jobs: {str(e)}")
             raise
@@ -57,36 +178,35 @@ class JobService:
         page: int = 1,
         size: int = 20,
         sort_by: str = "created_at",
-        sort_order: str = "desc"
-    ) -> Tuple[List[Job], int]:
-        """Search jobs with various filters."""
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        columns: Optional[List[Any]] = None
+    ) -> Tuple[List[Job], int, bool]:
+        """Search jobs with various filters.
+        
+        Returns the page, the total and whether that total is exact. When
+        `columns` is given the page holds rows of just those columns instead
+        of Job objects.
+        """
         try:
-            # Calculate offset
-            offset = (page - 1) * size
-            
             # Build base query
             query = db.query(Job).filter(Job.is_active == True)
             
-            # Apply text search
+            # Apply full-text search (served by the GIN index on search_vector)
+            rank = None
             if search_params.query:
-                search_term = f"%{search_params.query}%"
-                query = query.filter(
-                    or_(
-                        Job.title.ilike(search_term),
-                        Job.description.ilike(search_term),
-                        Job.company.ilike(search_term)
-                    )
-                )
+                ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search_params.query)
+                query = query.filter(Job.search_vector.op('@@')(ts_query))
+                rank = func.ts_rank(Job.search_vector, ts_query)
             
             # Apply location filter
             if search_params.location:
-                location_term = f"%{search_params.location}%"
-                query = query.filter(Job.location.ilike(location_term))
+                query = query.filter(Job.location.ilike(contains_pattern(search_params.location), escape="\\"))
             
             # Apply company filter
             if search_params.company:
-                company_term = f"%{search_params.company}%"
-                query = query.filter(Job.company.ilike(company_term))
+                query = query.filter(Job.company.ilike(contains_pattern(search_params.company), escape="\\"))
             
             # Apply source filter
             if search_params.source:
@@ -106,14 +226,14 @@ class JobService:
             
             # Apply industry filter
             if search_params.industry:
-                industry_term = f"%{search_params.industry}%"
-                query = query.filter(Job.industry.ilike(industry_term))
+                query = query.filter(Job.industry.ilike(contains_pattern(search_params.industry), escape="\\"))
+            
+            # Apply salary range filter (jobs whose annual range overlaps the requested one)
+            if search_params.salary_min is not None:
+                query = query.filter(Job.salary_max_annual >= search_params.salary_min)
             
-            # Apply salary range filter
-            if search_params.salary_min is not None or search_params.salary_max is not None:
-                # This is a simplified implementation
-                # In production, you'd want to parse salary strings and extract numeric values
-                pass
+            if search_params.salary_max is not None:
+                query = query.filter(Job.salary_min_annual <= search_params.salary_max)
             
             # Apply date range filter
             if search_params.date_from:
@@ -122,26 +242,201 @@ class JobService:
             if search_params.date_to:
                 query = query.filter(Job.date_posted <= search_params.date_to)
             
-            # Apply sorting
-            if hasattr(Job, sort_by):
-                sort_column = getattr(Job, sort_by)
-                if sort_order.lower() == "desc":
-                    query = query.order_by(desc(sort_column))
-                else:
-                    query = query.order_by(asc(sort_column))
-            
             # Get total count
-            total = query.count()
+            total, total_exact = self._count(db, query, count_mode)
+            
+            if columns:
+                query = query.with_entities(*self._with_sort_column(columns, sort_by))
             
-            # Apply pagination
-            jobs = query.offset(offset).limit(size).all()
+            # Apply sorting and pagination
+            if sort_by == RELEVANCE_SORT:
+                jobs = self._paginate_by_relevance(query, rank, page, size, sort_order, cursor)
+            else:
+                jobs = self._paginate(query, page, size, sort_by, sort_order, cursor)
             
-            return jobs, total
+            return jobs, total, total_exact
             
+        except (InvalidCursorError, InvalidSortError):
+            raise
         except Exception as e:
             logger.error(f"Error searching jobs: {str(e)}")
             raise
     
+    def _count(self, db: Session, query: Query, count_mode: CountMode) -> Tuple[int, bool]:
+        """Count the rows matched by the query using the requested strategy."""
+        query = query.order_by(None)
+        
+        if count_mode == CountMode.CAPPED:
+            cap = settings.count_cap
+            capped = query.with_entities(Job.id).limit(cap + 1).subquery()
+            total = db.query(func.count()).select_from(capped).scalar()
+            if total > cap:
+                return cap, False
+            return total, True
+        
+        if count_mode == CountMode.ESTIMATED:
+            estimate = self._estimate_rows(db, query)
+            # Planner estimates are unreliable for small result sets, which are cheap to count
+            if estimate is not None and estimate > settings.count_cap:
+                return estimate, False
+            return query.count(), True
+        
+        if count_mode == CountMode.CACHED:
+            compiled = query.statement.compile(dialect=db.get_bind().dialect)
+            key = (str(compiled), tuple(sorted(compiled.params.items())))
+            total = self.count_cache.get(key)
+            if total is None:
+                total = query.count()
+                self.count_cache.set(key, total)
+            return total, True
+        
+        return query.count(), True
+    
+    def _estimate_rows(self, db: Session, query: Query) -> Optional[int]:
+        """Read the planner's row estimate for the query from EXPLAIN.
+        
+        The EXPLAIN runs in a savepoint, so if it fails the transaction is
+        still usable for the fallback COUNT and the page query.
+        """
+        try:
+            compiled = query.with_entities(Job.id).statement.compile(dialect=db.get_bind().dialect)
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[name] for name in compiled.positiontup)
+            # Leaving the block with an error rolls back to the savepoint
+            with db.begin_nested():
+                result = db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", params
+                ).scalar()
+            plan = json.loads(result) if isinstance(result, str) else result
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Could not estimate row count, falling back to exact count: {str(e)}")
+            return None
+    
+    def _with_sort_column(self, columns: List[Any], sort_by: str) -> List[Any]:
+        """Make sure the sort column is selected so next_cursor can read it.
+        
+        A sort column the projection leaves out is added under
+        CURSOR_KEY_LABEL, which render_page strips from the items.
+        """
+        if sort_by not in SORT_COLUMNS or any(column.key == sort_by for column in columns):
+            return columns
+        return list(columns) + [getattr(Job, sort_by).label(CURSOR_KEY_LABEL)]
+    
+    def next_cursor(self, jobs: List[Job], size: int, sort_by: str, sort_order: str) -> Optional[str]:
+        """Build the cursor for the page following `jobs`, or None on the last page."""
+        if not jobs or len(jobs) < size or sort_by == RELEVANCE_SORT:
+            return None
+        
+        last_job = jobs[-1]
+        sort_by = sort_by if sort_by in SORT_COLUMNS else "id"
+        key = getattr(last_job, sort_by) if hasattr(last_job, sort_by) else getattr(last_job, CURSOR_KEY_LABEL)
+        return encode_cursor(sort_by, sort_order, key, last_job.id)
+    
+    def _paginate(
+        self,
+        query: Query,
+        page: int,
+        size: int,
+        sort_by: str,
+        sort_order: str,
+        cursor: Optional[str]
+    ) -> List[Job]:
+        """Order the query by (sort column, id) and fetch one page.
+        
+        With a cursor the page starts right after the row the cursor encodes
+        (keyset pagination), so the cost does not grow with page depth. Without
+        one the classic offset/limit page is returned.
+        """
+        descending = sort_order.lower() == "desc"
+        direction = desc if descending else asc
+        
+        if sort_by in SORT_COLUMNS:
+            query = query.order_by(direction(getattr(Job, sort_by)), direction(Job.id))
+        elif sort_by == "id":
+            query = query.order_by(direction(Job.id))
+        else:
+            raise InvalidSortError(f"Cannot sort by {sort_by!r}; use one of: id, {', '.join(SORT_COLUMNS)}")
+        
+        if cursor:
+            query = query.filter(self._cursor_filter(cursor, sort_by, descending))
+            return query.limit(size).all()
+        
+        return query.offset((page - 1) * size).limit(size).all()
+    
+    def _paginate_by_relevance(
+        self,
+        query: Query,
+        rank,
+        page: int,
+        size: int,
+        sort_order: str,
+        cursor: Optional[str]
+    ) -> List[Job]:
+        """Order the query by ts_rank and fetch one offset page."""
+        if cursor:
+            raise InvalidCursorError("Cursor pagination is not supported when sorting by relevance")
+        if rank is None:
+            # Nothing to rank against without a query; fall back to newest first
+            return self._paginate(query, page, size, "created_at", sort_order, None)
+        
+        direction = desc if sort_order.lower() == "desc" else asc
+        query = query.order_by(direction(rank), direction(Job.id))
+        return query.offset((page - 1) * size).limit(size).all()
+    
+    def _cursor_filter(self, cursor: str, sort_by: str, descending: bool):
+        """Build the WHERE clause selecting the rows after the cursor position."""
+        payload = decode_cursor(cursor)
+        if payload.get("s") != sort_by or payload.get("o") != ("desc" if descending else "asc"):
+            raise InvalidCursorError("Cursor does not match the requested sort order")
+        
+        last_id = payload["id"]
+        if sort_by == "id":
+            return Job.id < last_id if descending else Job.id > last_id
+        
+        column = getattr(Job, sort_by)
+        value = payload.get("k")
+        if value is not None and isinstance(Job.__table__.columns[sort_by].type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Invalid cursor: bad sort key")
+        
+        # Postgres sorts NULLs first in DESC order and last in ASC order
+        if value is None:
+            if descending:
+                return or_(and_(column.is_(None), Job.id < last_id), column.isnot(None))
+            return and_(column.is_(None), Job.id > last_id)
+        
+        if descending:
+            return tuple_(column, Job.id) < tuple_(value, last_id)
+        return or_(tuple_(column, Job.id) > tuple_(value, last_id), column.is_(None))
+    
+    def suggest_locations(self, db: Session, term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Suggest known locations similar to a (possibly misspelled) term."""
+        try:
+            suggestions = db.query(
+                Job.location,
+                func.max(func.similarity(Job.location, term)).label('similarity'),
+                func.count(Job.id).label('count')
+            ).filter(
+                Job.is_active == True,
+                Job.location.op('%')(term)
+            ).group_by(Job.location).order_by(
+                desc('similarity'),
+                desc('count')
+            ).limit(limit).all()
+            
+            return [
+                {"location": location, "similarity": round(score, 3), "count": count}
+                for location, score, count in suggestions
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error suggesting locations for {term!r}: {str(e)}")
+            raise
+    
     def get_job_by_id(self, db: Session, job_id: int) -> Optional[Job]:
         """Get a specific job by ID."""
         try:
@@ -160,52 +455,31 @@ class JobService:
                 job_data.location
             )
             
+            values = self._job_values(job_data)
+            
             # Check if job already exists
             existing_job = db.query(Job).filter(Job.job_hash == job_hash).first()
             if existing_job:
+                if existing_job.content_hash == values["content_hash"] and existing_job.is_active:
+                    # Nothing changed: skip the write entirely
+                    return existing_job
+                
                 # Update existing job
-                existing_job.title = job_data.title
-                existing_job.company = job_data.company
-                existing_job.location = job_data.location
-                existing_job.salary = job_data.salary
-                existing_job.description = job_data.description
-                existing_job.apply_url = job_data.apply_url
-                existing_job.source = job_data.source
-                existing_job.date_posted = job_data.date_posted
-                existing_job.job_type = job_data.job_type
-                existing_job.experience_level = job_data.experience_level
-                existing_job.remote = job_data.remote
-                existing_job.skills = ','.join(job_data.skills) if job_data.skills else None
-                existing_job.benefits = ','.join(job_data.benefits) if job_data.benefits else None
-                existing_job.industry = job_data.industry
-                existing_job.updated_at = datetime.now()
-                existing_job.is_active = True
+                for column, value in values.items():
+                    if column not in ("created_at", "last_scraped"):
+                        setattr(existing_job, column, value)
                 
                 db.commit()
+                search_cache.bump_generation()
                 db.refresh(existing_job)
                 return existing_job
             
             # Create new job
-            job = Job(
-                title=job_data.title,
-                company=job_data.company,
-                location=job_data.location,
-                salary=job_data.salary,
-                description=job_data.description,
-                apply_url=job_data.apply_url,
-                source=job_data.source,
-                date_posted=job_data.date_posted,
-                job_hash=job_hash,
-                job_type=job_data.job_type,
-                experience_level=job_data.experience_level,
-                remote=job_data.remote,
-                skills=','.join(job_data.skills) if job_data.skills else None,
-                benefits=','.join(job_data.benefits) if job_data.benefits else None,
-                industry=job_data.industry
-            )
+            job = Job(job_hash=job_hash, **values)
             
             db.add(job)
             db.commit()
+            search_cache.bump_generation()
             db.refresh(job)
             
             logger.info(f"Created new job: {job.title} at {job.company}")
@@ -216,6 +490,77 @@ class JobService:
             db.rollback()
             raise
     
+    def bulk_upsert_jobs(self, db: Session, batch: List[Tuple[int, JobCreate]]) -> Dict[str, Any]:
+        """Insert or update a batch of validated jobs keyed on their hash.
+        
+        `batch` pairs each job with its position in the request so rejections
+        can be reported against it. Uses one INSERT ... ON CONFLICT (job_hash)
+        DO UPDATE for the batch; if that fails the rows are retried one at a
+        time and only the failing ones are rejected. When a hash repeats
+        within the batch only its last job is written; the others count as
+        `duplicate`.
+        
+        Does not invalidate the search cache; callers do that once rows were
+        inserted or updated.
+        """
+        rows = {}
+        for index, job_data in batch:
+            job_hash = Job.generate_hash(job_data.title, job_data.company, job_data.location)
+            rows[job_hash] = (index, {"job_hash": job_hash, **self._job_values(job_data)})
+        
+        summary = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicate": len(batch) - len(rows), "rejected": []}
+        try:
+            self._upsert_rows(db, [row for _, row in rows.values()], summary)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Bulk upsert of {len(rows)} jobs failed, retrying row by row: {str(e)}")
+            db.rollback()
+            summary.update(inserted=0, updated=0, unchanged=0)
+            for index, row in rows.values():
+                try:
+                    self._upsert_rows(db, [row], summary)
+                    db.commit()
+                except Exception as row_error:
+                    db.rollback()
+                    summary["rejected"].append({"index": index, "reason": str(row_error).splitlines()[0]})
+        return summary
+    
+    def _upsert_rows(self, db: Session, rows: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+        """Upsert job rows, adding inserted/updated/unchanged counts to `summary`."""
+        inserted, changed, unchanged = upsert_job_rows(db, rows)
+        summary["inserted"] += inserted
+        summary["updated"] += changed
+        summary["unchanged"] += len(unchanged)
+    
+    def _job_values(self, job_data: JobCreate) -> Dict[str, Any]:
+        """Column values for a job, derived from its create/update payload."""
+        now = datetime.now()
+        values = {
+            "title": job_data.title,
+            "company": job_data.company,
+            "location": job_data.location,
+            "salary": job_data.salary,
+            **salary_columns(job_data.salary),
+            "description": job_data.description,
+            "apply_url": job_data.apply_url,
+            "source": job_data.source,
+            "date_posted": job_data.date_posted,
+            "job_type": job_data.job_type,
+            "experience_level": job_data.experience_level,
+            "remote": job_data.remote,
+            "skills": ','.join(job_data.skills) if job_data.skills else None,
+            "benefits": ','.join(job_data.benefits) if job_data.benefits else None,
+            "industry": job_data.industry,
+        }
+        values["content_hash"] = Job.generate_content_hash(values)
+        return {
+            **values,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+            "last_scraped": now,
+        }
+    
     def update_job(self, db: Session, job_id: int, job_data: JobCreate) -> Optional[Job]:
         """Update an existing job."""
         try:
@@ -223,22 +568,15 @@ class JobService:
             if not job:
                 return None
             
+            values = self._job_values(job_data)
+            if job.content_hash == values["content_hash"]:
+                # Nothing changed: skip the write entirely
+                return job
+            
             # Update job fields
-            job.title = job_data.title
-            job.company = job_data.company
-            job.location = job_data.location
-            job.salary = job_data.salary
-            job.description = job_data.description
-            job.apply_url = job_data.apply_url
-            job.source = job_data.source
-            job.date_posted = job_data.date_posted
-            job.job_type = job_data.job_type
-            job.experience_level = job_data.experience_level
-            job.remote = job_data.remote
-            job.skills = ','.join(job_data.skills) if job_data.skills else None
-            job.benefits = ','.join(job_data.benefits) if job_data.benefits else None
-            job.industry = job_data.industry
-            job.updated_at = datetime.now()
+            for column, value in values.items():
+                if column not in ("created_at", "is_active", "last_scraped"):
+                    setattr(job, column, value)
             
             # Regenerate hash if key fields changed
             new_hash = Job.generate_hash(job_data.title, job_data.company, job_data.location)
@@ -246,6 +584,7 @@ class JobService:
                 job.job_hash = new_hash
             
             db.commit()
+            search_cache.bump_generation()
             db.refresh(job)
             
             logger.info(f"Updated job: {job.title} at {job.company}")
@@ -267,6 +606,7 @@ class JobService:
             job.updated_at = datetime.now()
             
             db.commit()
+            search_cache.bump_generation()
             
             logger.info(f"Deleted job: {job.title} at {job.company}")
             return True
@@ -276,92 +616,193 @@ class JobService:
             db.rollback()
             raise
     
-    def get_job_stats(self, db: Session) -> Dict[str, Any]:
-        """Get job statistics."""
+    def get_job_stats(self, db: Session, fresh: bool = False) -> Dict[str, Any]:
+        """Get job statistics from the latest rollup snapshot.
+        
+        Falls back to live aggregate queries when `fresh` is set or no
+        snapshot has been written yet.
+        """
         try:
-            # Total jobs
-            total_jobs = db.query(Job).count()
-            active_jobs = db.query(Job).filter(Job.is_active == True).count()
-            
-            # Jobs by source
-            jobs_by_source = db.query(
-                Job.source,
-                func.count(Job.id).label('count')
-            ).filter(Job.is_active == True).group_by(Job.source).all()
-            
-            # Jobs by industry
-            jobs_by_industry = db.query(
-                Job.industry,
-                func.count(Job.id).label('count')
-            ).filter(
-                Job.is_active == True,
-                Job.industry.isnot(None)
-            ).group_by(Job.industry).all()
-            
-            # Jobs by location (top 10)
-            jobs_by_location = db.query(
-                Job.location,
-                func.count(Job.id).label('count')
-            ).filter(Job.is_active == True).group_by(Job.location).order_by(
-                desc('count')
-            ).limit(10).all()
-            
-            # Jobs by type
-            jobs_by_type = db.query(
-                Job.job_type,
-                func.count(Job.id).label('count')
-            ).filter(
-                Job.is_active == True,
-                Job.job_type.isnot(None)
-            ).group_by(Job.job_type).all()
-            
-            # Recent jobs (last 7 days)
-            recent_date = datetime.now() - timedelta(days=7)
-            recent_jobs_count = db.query(Job).filter(
-                Job.is_active == True,
-                Job.created_at >= recent_date
-            ).count()
+            if not fresh:
+                snapshot = self.get_latest_stats_snapshot(db)
+                if snapshot:
+                    return snapshot.to_stats_dict()
             
-            # Remote jobs
-            remote_jobs_count = db.query(Job).filter(
-                Job.is_active == True,
-                Job.remote == True
-            ).count()
-            
-            return {
-                "total_jobs": total_jobs,
-                "active_jobs": active_jobs,
-                "jobs_by_source": {source: count for source, count in jobs_by_source},
-                "jobs_by_industry": {industry: count for industry, count in jobs_by_industry},
-                "jobs_by_location": {location: count for location, count in jobs_by_location},
-                "jobs_by_type": {job_type: count for job_type, count in jobs_by_type},
-                "recent_jobs_count": recent_jobs_count,
-                "remote_jobs_count": remote_jobs_count
-            }
+            return self.compute_job_stats(db)
             
         except Exception as e:
             logger.error(f"Error fetching job stats: {str(e)}")
             raise
     
-    def get_job_sources(self, db: Session) -> List[Dict[str, Any]]:
-        """Get list of job sources and their counts."""
+    def get_job_sources(self, db: Session, fresh: bool = False) -> List[Dict[str, Any]]:
+        """Get list of job sources and their counts from the latest rollup snapshot."""
         try:
-            sources = db.query(
-                Job.source,
-                func.count(Job.id).label('count'),
-                func.max(Job.last_scraped).label('last_scraped')
-            ).filter(Job.is_active == True).group_by(Job.source).all()
+            if not fresh:
+                snapshot = self.get_latest_stats_snapshot(db)
+                if snapshot:
+                    return snapshot.sources
             
-            return [
-                {
-                    "source": source,
-                    "count": count,
-                    "last_scraped": last_scraped.isoformat() if last_scraped else None,
-                    "is_active": True
-                }
-                for source, count, last_scraped in sources
-            ]
+            return self.compute_job_sources(db)
             
         except Exception as e:
             logger.error(f"Error fetching job sources: {str(e)}")
             raise
+    
+    def get_latest_stats_snapshot(self, db: Session) -> Optional[JobStatsSnapshot]:
+        """Get the most recent stats snapshot, if any."""
+        return db.query(JobStatsSnapshot).order_by(desc(JobStatsSnapshot.created_at)).first()
+    
+    def refresh_stats_snapshot(self, db: Session, keep: int = 48) -> JobStatsSnapshot:
+        """Compute job statistics and store them as a new snapshot.
+        
+        Only the newest `keep` snapshots are retained.
+        """
+        try:
+            stats = self.compute_job_stats(db)
+            snapshot = JobStatsSnapshot(
+                total_jobs=stats["total_jobs"],
+                active_jobs=stats["active_jobs"],
+                recent_jobs_count=stats["recent_jobs_count"],
+                remote_jobs_count=stats["remote_jobs_count"],
+                jobs_by_source=stats["jobs_by_source"],
+                jobs_by_industry=stats["jobs_by_industry"],
+                jobs_by_location=stats["jobs_by_location"],
+                jobs_by_type=stats["jobs_by_type"],
+                sources=self.compute_job_sources(db),
+            )
+            db.add(snapshot)
+            db.flush()
+            
+            # Prune old snapshots
+            stale_ids = db.query(JobStatsSnapshot.id).order_by(
+                desc(JobStatsSnapshot.created_at), desc(JobStatsSnapshot.id)
+            ).offset(keep)
+            db.query(JobStatsSnapshot).filter(
+                JobStatsSnapshot.id.in_(stale_ids.scalar_subquery())
+            ).delete(synchronize_session=False)
+            
+            db.commit()
+            db.refresh(snapshot)
+            return snapshot
+            
+        except Exception as e:
+            logger.error(f"Error refreshing job stats snapshot: {str(e)}")
+            db.rollback()
+            raise
+    
+    def compute_job_stats(self, db: Session) -> Dict[str, Any]:
+        """Compute job statistics with live aggregate queries."""
+        # Totals in a single pass
+        recent_date = datetime.now() - timedelta(days=7)
+        active = Job.is_active == True
+        total_jobs, active_jobs, recent_jobs_count, remote_jobs_count = db.query(
+            func.count(Job.id),
+            func.count(Job.id).filter(active),
+            func.count(Job.id).filter(active, Job.created_at >= recent_date),
+            func.count(Job.id).filter(active, Job.remote == True)
+        ).one()
+        
+        # Jobs by source
+        jobs_by_source = db.query(
+            Job.source,
+            func.count(Job.id).label('count')
+        ).filter(active).group_by(Job.source).all()
+        
+        # Jobs by industry
+        jobs_by_industry = db.query(
+            Job.industry,
+            func.count(Job.id).label('count')
+        ).filter(
+            active,
+            Job.industry.isnot(None)
+        ).group_by(Job.industry).all()
+        
+        # Jobs by location (top 10)
+        jobs_by_location = db.query(
+            Job.location,
+            func.count(Job.id).label('count')
+        ).filter(active).group_by(Job.location).order_by(
+            desc('count')
+        ).limit(10).all()
+        
+        # Jobs by type
+        jobs_by_type = db.query(
+            Job.job_type,
+            func.count(Job.id).label('count')
+        ).filter(
+            active,
+            Job.job_type.isnot(None)
+        ).group_by(Job.job_type).all()
+        
+        return {
+            "total_jobs": total_jobs,
+            "active_jobs": active_jobs,
+            "jobs_by_source": {source: count for source, count in jobs_by_source},
+            "jobs_by_industry": {industry: count for industry, count in jobs_by_industry},
+            "jobs_by_location": {location: count for location, count in jobs_by_location},
+            "jobs_by_type": {job_type: count for job_type, count in jobs_by_type},
+            "recent_jobs_count": recent_jobs_count,
+            "remote_jobs_count": remote_jobs_count,
+            "generated_at": datetime.now().isoformat()
+        }
+    
+    def compute_job_sources(self, db: Session) -> List[Dict[str, Any]]:
+        """Compute job sources and their counts with a live aggregate query."""
+        sources = db.query(
+            Job.source,
+            func.count(Job.id).label('count'),
+            func.max(Job.last_scraped).label('last_scraped')
+        ).filter(Job.is_active == True).group_by(Job.source).all()
+        
+        return [
+            {
+                "source": source,
+                "count": count,
+                "last_scraped": last_scraped.isoformat() if last_scraped else None,
+                "is_active": True
+            }
+            for source, count, last_scraped in sources
+        ]
+
+class AsyncJobService:
+    """Async counterpart of JobService for the read endpoints.
+    
+    Each call runs the JobService query code through AsyncSession.run_sync, so
+    the SQL is sent over asyncpg without blocking the event loop while the
+    filtering, pagination and counting logic stays in one place.
+    """
+    
+    def __init__(self, job_service: Optional[JobService] = None):
+        self.job_service = job_service or JobService()
+    
+    async def get_jobs(self, db: AsyncSession, **kwargs) -> Tuple[List[Job], int, bool]:
+        """Get paginated list of jobs."""
+        return await db.run_sync(lambda session: self.job_service.get_jobs(session, **kwargs))
+    
+    async def search_jobs(self, db: AsyncSession, **kwargs) -> Tuple[List[Job], int, bool]:
+        """Search jobs with various filters."""
+        return await db.run_sync(lambda session: self.job_service.search_jobs(session, **kwargs))
+    
+    async def suggest_locations(self, db: AsyncSession, term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Suggest known locations similar to a (possibly misspelled) term."""
+        return await db.run_sync(lambda session: self.job_service.suggest_locations(session, term, limit))
+    
+    async def bulk_upsert_jobs(self, db: AsyncSession, batch: List[Tuple[int, JobCreate]]) -> Dict[str, Any]:
+        """Insert or update a batch of validated jobs keyed on their hash."""
+        return await db.run_sync(lambda session: self.job_service.bulk_upsert_jobs(session, batch))
+    
+    async def get_job_by_id(self, db: AsyncSession, job_id: int) -> Optional[Job]:
+        """Get a specific job by ID."""
+        return await db.run_sync(lambda session: self.job_service.get_job_by_id(session, job_id))
+    
+    async def get_job_stats(self, db: AsyncSession, fresh: bool = False) -> Dict[str, Any]:
+        """Get job statistics."""
+        return await db.run_sync(lambda session: self.job_service.get_job_stats(session, fresh))
+    
+    async def get_job_sources(self, db: AsyncSession, fresh: bool = False) -> List[Dict[str, Any]]:
+        """Get list of job sources and their counts."""
+        return await db.run_sync(lambda session: self.job_service.get_job_sources(session, fresh))
+    
+    def next_cursor(self, jobs: List[Job], size: int, sort_by: str, sort_order: str) -> Optional[str]:
+        """Build the cursor for the page following `jobs`, or None on the last page."""
+        return self.job_service.next_cursor(jobs, size, sort_by, sort_order)
@@ -0,0 +1 @@
+# Micro-benchmarks for GigM8 backend hot paths
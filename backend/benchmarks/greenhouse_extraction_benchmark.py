@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: Greenhouse HTML fallback extraction.
+
+Compares the original selector chains (CSS fallbacks tried on every card,
+with a generic div[class*="job"] card selector) against the compiled
+ExtractorRegistry used by GreenhouseJobsSpider.parse_web, on the saved board
+pages in benchmarks/fixtures/greenhouse. "learned" reuses the layout learned
+for the board, as later pages and crawls do; "cold" learns it on every page.
+
+Run from the backend directory:
+    python -m benchmarks.greenhouse_extraction_benchmark --rounds 200
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from lxml import html
+from parsel import Selector
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scrapers"))
+
+from gigm8_scraper.extractors import ExtractorRegistry  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "greenhouse"
+
+
+def original_path(text: str):
+    """The selector chains parse_web/extract_job_from_web used before the registry."""
+    response = Selector(text=text)
+    job_cards = response.css('div[data-qa="job-posting"]') or response.css('div.job-posting') or response.css('div[class*="job"]')
+    jobs = []
+    for card in job_cards:
+        title = card.css('h3 a::text').get() or card.css('h4 a::text').get() or card.css('a[href*="/jobs/"]::text').get()
+        location = card.css('span[class*="location"]::text').get() or card.css('div[class*="location"]::text').get()
+        apply_url = card.css('h3 a::attr(href)').get() or card.css('h4 a::attr(href)').get() or card.css('a[href*="/jobs/"]::attr(href)').get()
+        if title and location and apply_url:
+            jobs.append((title.strip(), location.strip(), apply_url.strip()))
+    return jobs
+
+
+def registry_path(registry: ExtractorRegistry, board: str, text: str):
+    root = html.fromstring(text)
+    return [
+        (card["title"], card["location"], card["url"])
+        for card in registry.extract(board, root)
+        if card["title"] and card["location"] and card["url"]
+    ]
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"  {label:<9} {elapsed * 1000:8.3f} ms/page {1 / elapsed:9.1f} pages/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Greenhouse HTML job card extraction")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages parsed per path and fixture")
+    args = parser.parse_args()
+
+    for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+        text = fixture.read_text()
+        board = fixture.stem
+        learned = ExtractorRegistry()
+
+        original_jobs = original_path(text)
+        registry_jobs = registry_path(learned, board, text)
+        layout = learned.learned[board]["cards"] if board in learned.learned else None
+        print(f"{fixture.name}: layout {layout}, {len(registry_jobs)} jobs "
+              f"(original chain: {len(original_jobs)} items, {len(set(original_jobs))} distinct)")
+
+        original = bench("original", lambda: original_path(text), args.rounds)
+        warm = bench("learned", lambda: registry_path(learned, board, text), args.rounds)
+        cold = bench("cold", lambda: registry_path(ExtractorRegistry(), board, text), args.rounds)
+        print(f"  speedup   {original / warm:8.2f}x learned, {original / cold:.2f}x cold")
+
+
+if __name__ == "__main__":
+    main()
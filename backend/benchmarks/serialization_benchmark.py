@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: job listing serialization paths.
+
+Compares the original list-endpoint path (Job.to_dict() -> PaginatedResponse ->
+FastAPI response validation -> jsonable_encoder -> json.dumps) with the fast
+path (column rows -> orjson) used by /jobs and /jobs/search.
+
+Run from the backend directory:
+    python -m benchmarks.serialization_benchmark --items 100 --rounds 200
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from models.job import Job, LIST_COLUMNS
+from app.schemas import PaginatedResponse, CountMode
+from app.serialization import render_page
+
+Row = namedtuple("Row", [column.key for column in LIST_COLUMNS])
+
+
+def make_jobs(count: int, description_size: int):
+    """Build detached Job objects and equivalent column rows."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    description = ("Build and operate distributed systems. " * (description_size // 40 + 1))[:description_size]
+    jobs, rows = [], []
+    for i in range(count):
+        values = {
+            "id": i + 1,
+            "title": f"Software Engineer {i}",
+            "company": "Example Corp",
+            "location": "Remote, US",
+            "salary": "$120,000 - $160,000",
+            "salary_min_annual": 120000,
+            "salary_max_annual": 160000,
+            "salary_currency": "USD",
+            "description": description,
+            "apply_url": f"https://example.com/jobs/{i}",
+            "source": "Greenhouse (Example)",
+            "date_posted": now - timedelta(days=i % 30),
+            "created_at": now,
+            "updated_at": now,
+            "job_type": "full-time",
+            "experience_level": "mid",
+            "remote": True,
+            "skills": "python,sql,kubernetes",
+            "benefits": "health,401k",
+            "industry": "Technology",
+            "is_active": True,
+        }
+        jobs.append(Job(**values))
+        rows.append(Row(**values))
+    return jobs, rows
+
+
+def original_path(jobs) -> bytes:
+    """Mimic FastAPI's handling of a PaginatedResponse return value."""
+    response = PaginatedResponse(
+        items=[job.to_dict() for job in jobs],
+        total=10000,
+        page=1,
+        size=len(jobs),
+        pages=100,
+    )
+    validated = PaginatedResponse.model_validate(response.model_dump())
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows) -> bytes:
+    """Encode column rows straight to the response body."""
+    return render_page(
+        rows,
+        total=10000,
+        page=1,
+        size=len(rows),
+        next_cursor=None,
+        count_mode=CountMode.EXACT,
+        total_exact=True,
+    )
+
+
+def bench(label: str, fn, arg, rounds: int) -> float:
+    fn(arg)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(arg)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<10} {elapsed * 1000:8.3f} ms/page")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job listing serialization")
+    parser.add_argument("--items", type=int, default=100, help="Jobs per page")
+    parser.add_argument("--description-size", type=int, default=4000, help="Description length in characters")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages encoded per path")
+    args = parser.parse_args()
+
+    jobs, rows = make_jobs(args.items, args.description_size)
+
+    original_items = json.loads(original_path(jobs))["items"]
+    fast_items = json.loads(fast_path(rows))["items"]
+    assert original_items == fast_items, "fast path output differs from the original path"
+
+    print(f"{args.items} items/page, {args.description_size}-char descriptions, {args.rounds} rounds")
+    original = bench("original", original_path, jobs, args.rounds)
+    fast = bench("fast", fast_path, rows, args.rounds)
+    print(f"speedup    {original / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,12 @@ def create_migration(message):
     print(f"📝 Creating migration: {message}")
     run_command(["docker-compose", "exec", "api", "alembic", "revision", "--autogenerate", "-m", message])
 
+def backfill_salaries():
+    """Populate normalized salary columns for existing jobs."""
+    print("💰 Backfilling salary columns...")
+    run_command(["docker-compose", "exec", "celery_worker", "celery", "-A", "scheduler.celery_app",
+                 "call", "scheduler.tasks.backfill_salary_columns"])
+
 def run_spider(spider_name):
     """Run a specific spider."""
     print(f"🕷️ Running spider: {spider_name}")
@@ -115,6 +121,7 @@ def main():
     subparsers.add_parser("migrate", help="Run database migrations")
     create_migration_parser = subparsers.add_parser("create-migration", help="Create a new migration")
     create_migration_parser.add_argument("message", help="Migration message")
+    subparsers.add_parser("backfill-salaries", help="Populate normalized salary columns")
     
     # Scraping
     run_spider_parser = subparsers.add_parser("run-spider", help="Run a specific spider")
@@ -149,6 +156,8 @@ def main():
         run_migrations()
     elif args.command == "create-migration":
         create_migration(args.message)
+    elif args.command == "backfill-salaries":
+        backfill_salaries()
     elif args.command == "run-spider":
         run_spider(args.spider_name)
     elif args.command == "run-all-spiders":
@@ -14,6 +14,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import models
 from models.database import Base
 from models.job import Job
+from models.job_stats import JobStatsSnapshot
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
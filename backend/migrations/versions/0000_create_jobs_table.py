@@ -0,0 +1,62 @@
+"""create jobs table
+
+Revision ID: 0000
+Revises: 
+Create Date: 2026-10-17 08:00:00.000000
+
+Baseline schema of the jobs table, before the later revisions add search,
+salary and fingerprint columns. A database whose jobs table already exists
+from before migrations were used is marked as at this revision with
+`alembic stamp 0000` before `alembic upgrade head`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('company', sa.String(length=255), nullable=False),
+        sa.Column('location', sa.String(length=255), nullable=False),
+        sa.Column('salary', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('apply_url', sa.Text(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('date_posted', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('job_hash', sa.String(length=64), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=True),
+        sa.Column('experience_level', sa.String(length=50), nullable=True),
+        sa.Column('remote', sa.Boolean(), nullable=False),
+        sa.Column('skills', sa.Text(), nullable=True),
+        sa.Column('benefits', sa.Text(), nullable=True),
+        sa.Column('industry', sa.String(length=100), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_scraped', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_title', 'jobs', ['title'])
+    op.create_index('ix_jobs_company', 'jobs', ['company'])
+    op.create_index('ix_jobs_location', 'jobs', ['location'])
+    op.create_index('ix_jobs_source', 'jobs', ['source'])
+    op.create_index('ix_jobs_date_posted', 'jobs', ['date_posted'])
+    op.create_index('ix_jobs_job_hash', 'jobs', ['job_hash'], unique=True)
+    op.create_index('ix_jobs_industry', 'jobs', ['industry'])
+    op.create_index('idx_job_search', 'jobs', ['title', 'company', 'location'])
+    op.create_index('idx_source_date', 'jobs', ['source', 'date_posted'])
+    op.create_index('idx_remote_active', 'jobs', ['remote', 'is_active'])
+    op.create_index('idx_industry_active', 'jobs', ['industry', 'is_active'])
+
+
+def downgrade() -> None:
+    op.drop_table('jobs')
@@ -0,0 +1,44 @@
+"""add weighted full-text search vector to jobs
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = '0000'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'jobs',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index(
+        'idx_job_search_vector',
+        'jobs',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_job_search_vector', table_name='jobs')
+    op.drop_column('jobs', 'search_vector')
@@ -0,0 +1,35 @@
+"""add pg_trgm indexes for location, company and industry filters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_COLUMNS = ['location', 'company', 'industry']
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'idx_job_{column}_trgm',
+            'jobs',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'idx_job_{column}_trgm', table_name='jobs')
@@ -0,0 +1,42 @@
+"""add job statistics snapshot table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stats_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('total_jobs', sa.Integer(), nullable=False),
+        sa.Column('active_jobs', sa.Integer(), nullable=False),
+        sa.Column('recent_jobs_count', sa.Integer(), nullable=False),
+        sa.Column('remote_jobs_count', sa.Integer(), nullable=False),
+        sa.Column('jobs_by_source', postgresql.JSONB(), nullable=False),
+        sa.Column('jobs_by_industry', postgresql.JSONB(), nullable=False),
+        sa.Column('jobs_by_location', postgresql.JSONB(), nullable=False),
+        sa.Column('jobs_by_type', postgresql.JSONB(), nullable=False),
+        sa.Column('sources', postgresql.JSONB(), nullable=False),
+    )
+    op.create_index('ix_job_stats_snapshots_id', 'job_stats_snapshots', ['id'])
+    op.create_index('ix_job_stats_snapshots_created_at', 'job_stats_snapshots', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_stats_snapshots_created_at', table_name='job_stats_snapshots')
+    op.drop_index('ix_job_stats_snapshots_id', table_name='job_stats_snapshots')
+    op.drop_table('job_stats_snapshots')
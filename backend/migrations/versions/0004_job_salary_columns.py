@@ -0,0 +1,34 @@
+"""add normalized annual salary columns to jobs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:00:00.000000
+
+Existing rows are populated by the scheduler.tasks.backfill_salary_columns
+task (python manage.py backfill-salaries), which reuses the ingest parser.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('salary_min_annual', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_max_annual', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_currency', sa.String(length=3), nullable=True))
+    op.create_index('idx_job_salary_min', 'jobs', ['salary_min_annual'])
+    op.create_index('idx_job_salary_max', 'jobs', ['salary_max_annual'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_job_salary_max', table_name='jobs')
+    op.drop_index('idx_job_salary_min', table_name='jobs')
+    op.drop_column('jobs', 'salary_currency')
+    op.drop_column('jobs', 'salary_max_annual')
+    op.drop_column('jobs', 'salary_min_annual')
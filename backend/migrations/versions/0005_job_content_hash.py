@@ -0,0 +1,26 @@
+"""add content fingerprint column to jobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00.000000
+
+Existing rows start without a fingerprint; the next write to each row
+(a recrawl or an update) fills it in.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'content_hash')
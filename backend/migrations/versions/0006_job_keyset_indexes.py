@@ -0,0 +1,39 @@
+"""add keyset pagination indexes to jobs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 12:00:00.000000
+
+One partial (sort column DESC, id DESC) index over active jobs per sortable
+column, matching the ORDER BY of cursor pagination; Postgres scans them
+backwards for ascending order.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+SORT_COLUMNS = (
+    "created_at", "updated_at", "date_posted", "title", "company",
+    "salary_min_annual", "salary_max_annual",
+)
+
+
+def upgrade() -> None:
+    for column in SORT_COLUMNS:
+        op.create_index(
+            f'idx_job_{column}_keyset',
+            'jobs',
+            [sa.text(f'{column} DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('is_active'),
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(SORT_COLUMNS):
+        op.drop_index(f'idx_job_{column}_keyset', table_name='jobs')
@@ -1,4 +1,5 @@
-from .database import engine, SessionLocal, Base
+from .database import engine, SessionLocal, async_engine, AsyncSessionLocal, Base
 from .job import Job
+from .job_stats import JobStatsSnapshot
 
-__all__ = ["engine", "SessionLocal", "Base", "Job"]
+__all__ = ["engine", "SessionLocal", "async_engine", "AsyncSessionLocal", "Base", "Job", "JobStatsSnapshot"]
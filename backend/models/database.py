@@ -3,6 +3,7 @@ Database configuration and session management for GigM8 job aggregator.
 """
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
@@ -16,6 +17,29 @@ class Settings(BaseSettings):
     debug: bool = True
     log_level: str = "INFO"
     
+    # Pagination counts
+    count_cap: int = 1000
+    count_cache_ttl: int = 60
+    
+    # Search result cache (in-process LRU in front of Redis)
+    search_cache_ttl: int = 300
+    search_cache_local_ttl: int = 30
+    search_cache_size: int = 512
+    
+    # Expiry of jobs that stopped being scraped (scheduler.tasks.cleanup_old_jobs)
+    cleanup_days_old: int = 30
+    cleanup_chunk_size: int = 5000
+    cleanup_chunk_sleep: float = 0.1
+    
+    @property
+    def async_database_url(self) -> str:
+        """Database URL using the asyncpg driver."""
+        url = self.database_url
+        for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                return "postgresql+asyncpg://" + url[len(prefix):]
+        return url
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -33,6 +57,15 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine and session factory (used by the read endpoints)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    echo=settings.debug
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -43,3 +76,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -2,12 +2,45 @@
 Job model for GigM8 job aggregator.
 """
 import hashlib
+import json
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Boolean, Computed, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from .database import Base
 
+# Weighted full-text document: title (A) > company (B) > description (C).
+# Postgres maintains the generated column itself on every insert and update.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+# Fields a listing's content fingerprint covers: everything a recrawl or an
+# update can change, but not bookkeeping like timestamps or is_active
+CONTENT_FIELDS = (
+    "title", "company", "location", "salary", "description", "apply_url",
+    "source", "date_posted", "job_type", "experience_level", "remote",
+    "skills", "benefits", "industry",
+)
+
+# Columns the list endpoints can sort by. Each has a partial (column, id)
+# index over active jobs, so keyset pages are an index range scan at any depth
+SORT_COLUMNS = (
+    "created_at", "updated_at", "date_posted", "title", "company",
+    "salary_min_annual", "salary_max_annual",
+)
+
+
+def keyset_index(column: str) -> Index:
+    """Partial index serving ORDER BY (column, id) over active jobs, in either direction."""
+    return Index(
+        f'idx_job_{column}_keyset', text(f'{column} DESC'), text('id DESC'),
+        postgresql_where=text('is_active'),
+    )
+
 class Job(Base):
     """Job model representing a job listing."""
     
@@ -23,6 +56,9 @@ class Job(Base):
     
     # Job details
     salary = Column(String(100), nullable=True)
+    salary_min_annual = Column(Integer, nullable=True)  # normalized from salary at ingest
+    salary_max_annual = Column(Integer, nullable=True)
+    salary_currency = Column(String(3), nullable=True)
     description = Column(Text, nullable=True)
     apply_url = Column(Text, nullable=False)
     source = Column(String(100), nullable=False, index=True)
@@ -34,6 +70,7 @@ class Job(Base):
     
     # Deduplication
     job_hash = Column(String(64), unique=True, nullable=False, index=True)
+    content_hash = Column(String(64), nullable=True)  # fingerprint of CONTENT_FIELDS
     
     # Additional fields for enhanced functionality
     job_type = Column(String(50), nullable=True)  # full-time, part-time, contract, etc.
@@ -47,12 +84,27 @@ class Job(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     last_scraped = Column(DateTime, default=func.now(), nullable=False)
     
+    # Full-text search document (deferred so list queries don't load it)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+    
     # Indexes for better query performance
     __table_args__ = (
         Index('idx_job_search', 'title', 'company', 'location'),
         Index('idx_source_date', 'source', 'date_posted'),
         Index('idx_remote_active', 'remote', 'is_active'),
         Index('idx_industry_active', 'industry', 'is_active'),
+        Index('idx_job_salary_min', 'salary_min_annual'),
+        Index('idx_job_salary_max', 'salary_max_annual'),
+        Index('idx_job_search_vector', 'search_vector', postgresql_using='gin'),
+        # Trigram indexes (pg_trgm) serving the substring ILIKE filters
+        Index('idx_job_location_trgm', 'location', postgresql_using='gin',
+              postgresql_ops={'location': 'gin_trgm_ops'}),
+        Index('idx_job_company_trgm', 'company', postgresql_using='gin',
+              postgresql_ops={'company': 'gin_trgm_ops'}),
+        Index('idx_job_industry_trgm', 'industry', postgresql_using='gin',
+              postgresql_ops={'industry': 'gin_trgm_ops'}),
+        # Keyset pagination indexes, one per sortable column
+        *(keyset_index(column) for column in SORT_COLUMNS),
     )
     
     @classmethod
@@ -61,6 +113,12 @@ class Job(Base):
         content = f"{title.lower().strip()}|{company.lower().strip()}|{location.lower().strip()}"
         return hashlib.sha256(content.encode()).hexdigest()
     
+    @classmethod
+    def generate_content_hash(cls, values: dict) -> str:
+        """Fingerprint the mutable fields of a job, to detect no-op updates."""
+        content = json.dumps([values.get(field) for field in CONTENT_FIELDS], default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
     def to_dict(self) -> dict:
         """Convert job instance to dictionary."""
         return {
@@ -69,6 +127,9 @@ class Job(Base):
             "company": self.company,
             "location": self.location,
             "salary": self.salary,
+            "salary_min_annual": self.salary_min_annual,
+            "salary_max_annual": self.salary_max_annual,
+            "salary_currency": self.salary_currency,
             "description": self.description,
             "apply_url": self.apply_url,
             "source": self.source,
@@ -86,3 +147,36 @@ class Job(Base):
     
     def __repr__(self):
         return f"<Job(id={self.id}, title='{self.title}', company='{self.company}')>"
+
+# Columns returned by the list endpoints, in to_dict() order. Selecting these
+# directly yields plain rows that can be encoded without building Job objects.
+LIST_COLUMNS = [
+    Job.id,
+    Job.title,
+    Job.company,
+    Job.location,
+    Job.salary,
+    Job.salary_min_annual,
+    Job.salary_max_annual,
+    Job.salary_currency,
+    Job.description,
+    Job.apply_url,
+    Job.source,
+    Job.date_posted,
+    Job.created_at,
+    Job.updated_at,
+    Job.job_type,
+    Job.experience_level,
+    Job.remote,
+    Job.skills,
+    Job.benefits,
+    Job.industry,
+    Job.is_active,
+]
+
+# Large Text columns list views never show; leaving them out of the SELECT
+# avoids reading their TOAST data at all
+HEAVY_COLUMNS = {"description", "skills", "benefits"}
+
+# Default projection for list endpoints
+SUMMARY_COLUMNS = [column for column in LIST_COLUMNS if column.key not in HEAVY_COLUMNS]
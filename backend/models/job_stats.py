@@ -0,0 +1,47 @@
+"""
+Job statistics snapshot model for GigM8 job aggregator.
+"""
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from .database import Base
+
+class JobStatsSnapshot(Base):
+    """Precomputed job statistics, written by the scheduler's rollup task."""
+    
+    __tablename__ = "job_stats_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False, index=True)
+    
+    # Totals
+    total_jobs = Column(Integer, nullable=False)
+    active_jobs = Column(Integer, nullable=False)
+    recent_jobs_count = Column(Integer, nullable=False)
+    remote_jobs_count = Column(Integer, nullable=False)
+    
+    # Breakdowns ({value: count})
+    jobs_by_source = Column(JSONB, nullable=False)
+    jobs_by_industry = Column(JSONB, nullable=False)
+    jobs_by_location = Column(JSONB, nullable=False)
+    jobs_by_type = Column(JSONB, nullable=False)
+    
+    # Per-source counts and last scrape time, as served by /jobs/sources
+    sources = Column(JSONB, nullable=False)
+    
+    def to_stats_dict(self) -> dict:
+        """Convert snapshot to the /jobs/stats payload."""
+        return {
+            "total_jobs": self.total_jobs,
+            "active_jobs": self.active_jobs,
+            "jobs_by_source": self.jobs_by_source,
+            "jobs_by_industry": self.jobs_by_industry,
+            "jobs_by_location": self.jobs_by_location,
+            "jobs_by_type": self.jobs_by_type,
+            "recent_jobs_count": self.recent_jobs_count,
+            "remote_jobs_count": self.remote_jobs_count,
+            "generated_at": self.created_at.isoformat(),
+        }
+    
+    def __repr__(self):
+        return f"<JobStatsSnapshot(id={self.id}, created_at={self.created_at}, active_jobs={self.active_jobs})>"
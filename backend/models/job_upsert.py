@@ -0,0 +1,76 @@
+"""
+Shared job upsert for GigM8 job aggregator.
+
+The bulk ingest endpoint and the scraper's database pipeline both write
+batches of job rows keyed on job_hash; this is the one place that decides
+whether an existing row has changed.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import literal_column, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .job import Job
+
+# Bind parameters Postgres (and asyncpg) accept in one statement
+MAX_BIND_PARAMS = 32767
+
+
+def upsert_job_rows(session: Session, rows: List[Dict[str, Any]]) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """Upsert job rows on job_hash in one statement; returns (inserted, changed, unchanged rows).
+
+    An existing row is only rewritten when its content fingerprint differs
+    or it was deactivated. Unchanged rows just have last_scraped refreshed,
+    in one UPDATE, so cleanup does not expire them. Does not commit. Rows
+    must have distinct job hashes.
+
+    Large batches are split into statements of at most MAX_BIND_PARAMS
+    parameters, the Postgres protocol limit.
+    """
+    if not rows:
+        return 0, 0, []
+    per_statement = max(MAX_BIND_PARAMS // len(rows[0]), 1)
+    if len(rows) > per_statement:
+        inserted = changed = 0
+        unchanged = []
+        for start in range(0, len(rows), per_statement):
+            chunk_inserted, chunk_changed, chunk_unchanged = upsert_job_rows(session, rows[start:start + per_statement])
+            inserted += chunk_inserted
+            changed += chunk_changed
+            unchanged += chunk_unchanged
+        return inserted, changed, unchanged
+
+    stmt = insert(Job).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.job_hash],
+        set_={
+            column: stmt.excluded[column]
+            for column in rows[0]
+            if column not in ("job_hash", "created_at")
+        },
+        where=or_(
+            Job.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            Job.is_active.is_(False)
+        )
+    ).returning(Job.job_hash, literal_column("xmax = 0"))
+    written = dict(session.execute(stmt).all())
+
+    unchanged = [row for row in rows if row["job_hash"] not in written]
+    touch_job_rows(session, unchanged)
+
+    inserted = sum(1 for was_inserted in written.values() if was_inserted)
+    return inserted, len(written) - inserted, unchanged
+
+
+def touch_job_rows(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Refresh last_scraped of stored, unchanged jobs without rewriting their content."""
+    if not rows:
+        return
+    session.execute(
+        update(Job)
+        .where(Job.job_hash.in_([row["job_hash"] for row in rows]))
+        .values(last_scraped=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,220 @@
+"""
+In-process Scrapy runner for GigM8 Celery tasks.
+
+The Scrapy project settings and spider classes are imported once per Celery
+worker process. Each crawl then runs in a forked child: it inherits those
+warm imports, but gets its own Twisted reactor (which cannot be restarted
+within a process) and its own working directory. Crawl stats come back to
+the task over a pipe.
+"""
+import json
+import logging
+import os
+import select
+import signal
+import sys
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from celery.signals import worker_process_init
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scrapers'))
+SETTINGS_MODULE = 'gigm8_scraper.settings'
+
+# Default crawl timeout, kept well under the Celery soft time limit (25 min)
+# so the runner times out and cleans up before the task is interrupted
+CRAWL_TIMEOUT = 20 * 60
+# Time a terminated crawl gets to close its browsers before it is killed
+STOP_GRACE_PERIOD = 30
+
+_project_settings = None
+
+
+def preload():
+    """Import the Scrapy project settings and spider classes into this process."""
+    global _project_settings
+    if _project_settings is not None:
+        return _project_settings
+
+    if SCRAPERS_DIR not in sys.path:
+        sys.path.insert(0, SCRAPERS_DIR)
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', SETTINGS_MODULE)
+
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    # Importing the spider modules is most of a cold start; forked crawls reuse them
+    SpiderLoader.from_settings(settings)
+    _project_settings = settings
+    logger.info(f"Preloaded Scrapy project from {SCRAPERS_DIR}")
+    return _project_settings
+
+
+def registered_spiders() -> List[str]:
+    """Names of every spider in the Scrapy project (the sources scrape_all_jobs fans out to)."""
+    from scrapy.spiderloader import SpiderLoader
+    return sorted(SpiderLoader.from_settings(preload()).list())
+
+
+@worker_process_init.connect
+def _preload_on_worker_start(**kwargs):
+    try:
+        preload()
+    except Exception as e:
+        # Crawl tasks retry the preload and report the error themselves
+        logger.error(f"Could not preload Scrapy project: {str(e)}")
+
+
+def run_spider(spider_name: str, timeout: float = CRAWL_TIMEOUT, **spider_kwargs) -> Dict[str, Any]:
+    """Run one crawl in a forked child and return its structured stats.
+
+    The result has `status` ("success" or "error"), `spider`, `items`,
+    `errors`, `duration`, `finish_reason` and the full Scrapy `stats`.
+    However the wait ends (result, timeout, or the task being interrupted),
+    the child's process group, including its browsers, is shut down.
+    """
+    settings = preload()
+    started = time.monotonic()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: never return into the Celery worker's code. Its own process
+        # group lets the parent stop it together with the browsers it starts.
+        os.setsid()
+        os.close(read_fd)
+        exit_code = 0
+        try:
+            result = _crawl(settings, spider_name, spider_kwargs)
+        except BaseException:
+            result = {"status": "error", "message": traceback.format_exc()}
+            exit_code = 1
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(json.dumps(result, default=str).encode())
+        finally:
+            os._exit(exit_code)
+
+    os.close(write_fd)
+    pipe = os.fdopen(read_fd, 'rb')
+    output = None
+    try:
+        output = _read_result(pipe, timeout)
+    finally:
+        pipe.close()
+        status = _stop_child(pid, graceful=output is not None)
+    duration = round(time.monotonic() - started, 3)
+
+    if output is None:
+        return _error(spider_name, f"Crawl timed out after {timeout}s", duration)
+    try:
+        result = json.loads(output)
+    except ValueError:
+        return _error(spider_name, f"Crawl process exited with status {status} without a result", duration)
+
+    if result.get("status") == "error" and "spider" not in result:
+        return _error(spider_name, result.get("message", "Crawl failed"), duration)
+    return result
+
+
+def _crawl(settings, spider_name: str, spider_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the crawl (forked child) and summarize its stats."""
+    from scrapy.crawler import CrawlerProcess
+
+    # Relative paths in the settings (HTTP cache, dedup index, crawl state)
+    # are relative to the scrapers directory; only this process changes cwd
+    os.chdir(SCRAPERS_DIR)
+
+    process = CrawlerProcess(settings.copy())
+    crawler = process.create_crawler(spider_name)
+    process.crawl(crawler, **spider_kwargs)
+    process.start()
+
+    stats = {key: _json_value(value) for key, value in crawler.stats.get_stats().items()}
+    finish_reason = stats.get('finish_reason')
+    errors = stats.get('log_count/ERROR', 0)
+    return {
+        "status": "success" if finish_reason == 'finished' else "error",
+        "spider": spider_name,
+        "items": stats.get('item_scraped_count', 0),
+        "dropped": stats.get('item_dropped_count', 0),
+        "errors": errors,
+        "duration": stats.get('elapsed_time_seconds'),
+        "finish_reason": finish_reason,
+        "stats": stats,
+    }
+
+
+def _read_result(pipe, timeout: float) -> Optional[bytes]:
+    """Read the child's result, or None if it doesn't finish within the timeout."""
+    chunks = []
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        ready, _, _ = select.select([pipe], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(pipe.fileno(), 65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def _stop_child(pid: int, graceful: bool) -> int:
+    """Reap the crawl child, terminating its process group first unless it finished.
+
+    SIGTERM lets Scrapy close its browsers; whatever is still running after
+    STOP_GRACE_PERIOD is killed. Returns the child's wait status.
+    """
+    if not graceful:
+        _signal_group(pid, signal.SIGTERM)
+        deadline = time.monotonic() + STOP_GRACE_PERIOD
+        while time.monotonic() < deadline:
+            reaped, status = os.waitpid(pid, os.WNOHANG)
+            if reaped:
+                break
+            time.sleep(0.2)
+        else:
+            logger.warning(f"Crawl process {pid} did not stop within {STOP_GRACE_PERIOD}s, killing it")
+            _signal_group(pid, signal.SIGKILL)
+            _, status = os.waitpid(pid, 0)
+    else:
+        _, status = os.waitpid(pid, 0)
+    # Stragglers left in the group (e.g. a browser that outlived the crawl)
+    _signal_group(pid, signal.SIGKILL)
+    return status
+
+
+def _signal_group(pid: int, signum: int) -> None:
+    try:
+        os.killpg(pid, signum)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _error(spider_name: str, message: str, duration: float) -> Dict[str, Any]:
+    logger.error(f"Crawl of {spider_name} failed: {message}")
+    return {
+        "status": "error",
+        "spider": spider_name,
+        "message": message,
+        "items": 0,
+        "errors": 1,
+        "duration": duration,
+        "finish_reason": None,
+    }
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
@@ -1,15 +1,18 @@
 """
 Celery tasks for GigM8 job aggregator.
 """
-import os
-import subprocess
 import logging
+import time
 from datetime import datetime, timedelta
-from celery import current_task
+from celery import current_task, chord, group
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, update
 from models.database import settings
 from models.job import Job
+from app.cache import search_cache
+from app.services import JobService
+from app.salary import salary_columns
+from scheduler.scrapy_runner import run_spider, registered_spiders
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,110 +22,112 @@ logger = logging.getLogger(__name__)
 engine = create_engine(settings.database_url)
 Session = sessionmaker(bind=engine)
 
+def crawl(spider_name):
+    """Run one spider and return its structured crawl stats (shared by the scrape tasks)."""
+    try:
+        logger.info(f"Starting {spider_name} scraping...")
+        result = run_spider(spider_name)
+        logger.info(f"{spider_name} scraping finished: {result['items']} items, "
+                    f"{result['errors']} errors in {result['duration']}s")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Error in {spider_name} scraping: {str(e)}")
+        return {"status": "error", "spider": spider_name, "message": str(e)}
+
 @current_task.task(bind=True)
 def scrape_microsoft_jobs(self):
     """Scrape Microsoft careers page."""
-    try:
-        logger.info("Starting Microsoft jobs scraping...")
-        
-        # Change to scrapers directory
-        scrapers_dir = os.path.join(os.path.dirname(__file__), '..', 'scrapers')
-        os.chdir(scrapers_dir)
-        
-        # Run Scrapy spider
-        result = subprocess.run([
-            'scrapy', 'crawl', 'microsoft_careers',
-            '-L', 'INFO'
-        ], capture_output=True, text=True, timeout=1800)  # 30 minutes timeout
-        
-        if result.returncode == 0:
-            logger.info("Microsoft jobs scraping completed successfully")
-            return {"status": "success", "message": "Microsoft jobs scraped successfully"}
-        else:
-            logger.error(f"Microsoft jobs scraping failed: {result.stderr}")
-            return {"status": "error", "message": result.stderr}
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Microsoft jobs scraping timed out")
-        return {"status": "error", "message": "Scraping timed out"}
-    except Exception as e:
-        logger.error(f"Error in Microsoft jobs scraping: {str(e)}")
-        return {"status": "error", "message": str(e)}
+    return crawl('microsoft_careers')
 
 @current_task.task(bind=True)
 def scrape_greenhouse_jobs(self):
     """Scrape Greenhouse job boards."""
-    try:
-        logger.info("Starting Greenhouse jobs scraping...")
-        
-        # Change to scrapers directory
-        scrapers_dir = os.path.join(os.path.dirname(__file__), '..', 'scrapers')
-        os.chdir(scrapers_dir)
-        
-        # Run Scrapy spider
-        result = subprocess.run([
-            'scrapy', 'crawl', 'greenhouse_jobs',
-            '-L', 'INFO'
-        ], capture_output=True, text=True, timeout=1800)  # 30 minutes timeout
-        
-        if result.returncode == 0:
-            logger.info("Greenhouse jobs scraping completed successfully")
-            return {"status": "success", "message": "Greenhouse jobs scraped successfully"}
-        else:
-            logger.error(f"Greenhouse jobs scraping failed: {result.stderr}")
-            return {"status": "error", "message": result.stderr}
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Greenhouse jobs scraping timed out")
-        return {"status": "error", "message": "Scraping timed out"}
-    except Exception as e:
-        logger.error(f"Error in Greenhouse jobs scraping: {str(e)}")
-        return {"status": "error", "message": str(e)}
+    return crawl('greenhouse_jobs')
 
 @current_task.task(bind=True)
-def cleanup_old_jobs(self):
-    """Clean up old inactive jobs."""
+def cleanup_old_jobs(self, days_old=None, chunk_size=None, sleep_seconds=None, cutoff=None, start_after_id=0):
+    """Mark jobs that haven't been scraped recently as inactive.
+    
+    Works in id order: each chunk selects the ids of up to n stale jobs, then
+    expires them with an UPDATE that repeats the staleness conditions, so a
+    job re-scraped in between is left alone. Each chunk is committed, so no
+    large set of rows is loaded or locked at once. Progress (including `last_id` and `cutoff`) is published as task
+    state; passing them back as `start_after_id` and `cutoff` resumes an
+    interrupted run. Re-running from scratch is also safe, since rows already
+    expired no longer match.
+    """
+    days_old = days_old if days_old is not None else settings.cleanup_days_old
+    chunk_size = chunk_size or settings.cleanup_chunk_size
+    sleep_seconds = sleep_seconds if sleep_seconds is not None else settings.cleanup_chunk_sleep
+    cutoff_date = datetime.fromisoformat(cutoff) if cutoff else datetime.now() - timedelta(days=days_old)
+    last_id = start_after_id
+    count = 0
+    
     try:
-        logger.info("Starting job cleanup...")
+        logger.info(f"Starting job cleanup (last scraped before {cutoff_date.isoformat()})...")
         
         session = Session()
-        
-        # Mark jobs as inactive if they haven't been scraped in 30 days
-        cutoff_date = datetime.now() - timedelta(days=30)
-        old_jobs = session.query(Job).filter(
-            Job.last_scraped < cutoff_date,
-            Job.is_active == True
-        ).all()
-        
-        count = 0
-        for job in old_jobs:
-            job.is_active = False
-            job.updated_at = datetime.now()
-            count += 1
-        
-        session.commit()
-        session.close()
+        try:
+            while True:
+                stale = (Job.is_active == True, Job.last_scraped < cutoff_date)
+                stale_ids = session.execute(
+                    select(Job.id).where(Job.id > last_id, *stale).order_by(Job.id).limit(chunk_size)
+                ).scalars().all()
+                if not stale_ids:
+                    break
+                
+                # Re-check staleness: a job re-scraped since the SELECT stays active
+                expired = session.execute(
+                    update(Job).where(Job.id.in_(stale_ids), *stale).values(
+                        is_active=False,
+                        updated_at=datetime.now()
+                    ).returning(Job.id)
+                ).scalars().all()
+                session.commit()
+                
+                last_id = stale_ids[-1]
+                count += len(expired)
+                self.update_state(state="PROGRESS", meta={
+                    "expired": count,
+                    "last_id": last_id,
+                    "cutoff": cutoff_date.isoformat(),
+                })
+                
+                if len(stale_ids) < chunk_size:
+                    break
+                if sleep_seconds:
+                    time.sleep(sleep_seconds)
+        finally:
+            session.close()
+            if count:
+                search_cache.bump_generation()
         
         logger.info(f"Marked {count} old jobs as inactive")
-        return {"status": "success", "message": f"Marked {count} old jobs as inactive"}
+        return {"status": "success", "message": f"Marked {count} old jobs as inactive", "expired": count}
         
     except Exception as e:
-        logger.error(f"Error in job cleanup: {str(e)}")
-        return {"status": "error", "message": str(e)}
+        logger.error(f"Error in job cleanup after {count} jobs (last id {last_id}): {str(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "expired": count,
+            "last_id": last_id,
+            "cutoff": cutoff_date.isoformat(),
+        }
 
 @current_task.task(bind=True)
 def update_job_stats(self):
-    """Update job statistics (placeholder for future stats aggregation)."""
+    """Roll job statistics up into a snapshot served by /jobs/stats and /jobs/sources."""
     try:
         logger.info("Updating job statistics...")
         
         session = Session()
-        
-        # Get basic stats
-        total_jobs = session.query(Job).count()
-        active_jobs = session.query(Job).filter(Job.is_active == True).count()
-        
-        session.close()
+        try:
+            snapshot = JobService().refresh_stats_snapshot(session)
+            total_jobs, active_jobs = snapshot.total_jobs, snapshot.active_jobs
+        finally:
+            session.close()
         
         logger.info(f"Job stats updated - Total: {total_jobs}, Active: {active_jobs}")
         return {
@@ -135,27 +140,93 @@ def update_job_stats(self):
         return {"status": "error", "message": str(e)}
 
 @current_task.task(bind=True)
-def scrape_all_jobs(self):
-    """Scrape all job sources."""
+def backfill_salary_columns(self, chunk_size=1000):
+    """Populate the normalized salary columns for jobs stored before they existed."""
     try:
-        logger.info("Starting comprehensive job scraping...")
+        logger.info("Backfilling salary columns...")
         
-        # Run all spiders
-        results = []
+        session = Session()
+        last_id = 0
+        scanned = 0
+        parsed = 0
         
-        # Microsoft jobs
-        microsoft_result = scrape_microsoft_jobs.delay()
-        results.append(("Microsoft", microsoft_result.get()))
+        try:
+            while True:
+                rows = session.query(Job.id, Job.salary).filter(
+                    Job.id > last_id,
+                    Job.salary.isnot(None),
+                    Job.salary_min_annual.is_(None)
+                ).order_by(Job.id).limit(chunk_size).all()
+                
+                if not rows:
+                    break
+                
+                updates = []
+                for job_id, salary in rows:
+                    columns = salary_columns(salary)
+                    if columns["salary_min_annual"] is not None:
+                        updates.append({"id": job_id, **columns})
+                
+                if updates:
+                    session.bulk_update_mappings(Job, updates)
+                session.commit()
+                
+                last_id = rows[-1][0]
+                scanned += len(rows)
+                parsed += len(updates)
+        finally:
+            session.close()
         
-        # Greenhouse jobs
-        greenhouse_result = scrape_greenhouse_jobs.delay()
-        results.append(("Greenhouse", greenhouse_result.get()))
+        if parsed:
+            search_cache.bump_generation()
+        
+        logger.info(f"Salary backfill done - scanned {scanned}, parsed {parsed}")
+        return {"status": "success", "scanned": scanned, "parsed": parsed}
+        
+    except Exception as e:
+        logger.error(f"Error backfilling salary columns: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+@current_task.task(bind=True)
+def scrape_spider(self, spider_name):
+    """Scrape a single source by spider name."""
+    return crawl(spider_name)
+
+@current_task.task(bind=True)
+def aggregate_scrape_results(self, results):
+    """Chord callback for scrape_all_jobs: combine the per-source crawl results."""
+    failed = [result.get("spider") for result in results if result.get("status") != "success"]
+    summary = {
+        "status": "success" if not failed else "partial" if len(failed) < len(results) else "error",
+        "sources": len(results),
+        "failed": failed,
+        "items": sum(result.get("items") or 0 for result in results),
+        "errors": sum(result.get("errors") or 0 for result in results),
+        # Sources run in parallel, so the run takes as long as the slowest one
+        "duration": max((result.get("duration") or 0 for result in results), default=0),
+        "results": {result.get("spider"): result for result in results},
+    }
+    logger.info(f"All sources scraped: {summary['items']} items from {summary['sources']} sources, "
+                f"{len(failed)} failed, {summary['duration']}s")
+    return summary
+
+@current_task.task(bind=True)
+def scrape_all_jobs(self):
+    """Scrape every registered source in parallel.
+    
+    Fans out one scrape_spider task per spider in the Scrapy project and
+    aggregates their results in aggregate_scrape_results, without holding
+    this worker slot while the crawls run.
+    """
+    try:
+        spiders = registered_spiders()
+        logger.info(f"Starting comprehensive job scraping of {len(spiders)} sources...")
         
-        # Log results
-        for source, result in results:
-            logger.info(f"{source} scraping result: {result}")
+        result = chord(
+            group(scrape_spider.s(spider_name) for spider_name in spiders)
+        )(aggregate_scrape_results.s())
         
-        return {"status": "success", "message": "All job sources scraped", "results": results}
+        return {"status": "started", "spiders": spiders, "aggregate_task_id": result.id}
         
     except Exception as e:
         logger.error(f"Error in comprehensive job scraping: {str(e)}")
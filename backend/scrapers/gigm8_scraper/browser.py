@@ -0,0 +1,74 @@
+"""
+Playwright helpers for GigM8 job aggregator spiders.
+
+Rendered pages only need their document, first-party scripts and the API
+calls that carry job data. Everything else (images, media, fonts,
+third-party scripts such as analytics) is aborted before it is fetched,
+which cuts both bandwidth and browser memory per page.
+"""
+import asyncio
+import re
+from itertools import count
+from typing import List
+from urllib.parse import urlparse
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+
+def site_of(url: str) -> str:
+    """Registrable part of a URL's host (last two labels), e.g. careers.microsoft.com -> microsoft.com."""
+    host = urlparse(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+def should_abort_request(request) -> bool:
+    """PLAYWRIGHT_ABORT_REQUEST predicate: drop assets a scraper never looks at."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    if request.resource_type == "script":
+        try:
+            page_url = request.frame.url
+        except Exception:
+            return False
+        return bool(page_url.startswith("http") and site_of(request.url) != site_of(page_url))
+    return False
+
+
+class ContextPool:
+    """Round-robin assignment of requests to a fixed set of browser contexts.
+
+    Contexts are created once (PLAYWRIGHT_CONTEXTS) and reused for every
+    page, instead of paying a new context per request; scrapy-playwright's
+    PLAYWRIGHT_MAX_CONTEXTS / PLAYWRIGHT_MAX_PAGES_PER_CONTEXT bound how many
+    pages render at once.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self._next = count()
+
+    def next(self) -> str:
+        return self.names[next(self._next) % len(self.names)]
+
+
+async def expect_results_response(page, request):
+    """Page init callback: start waiting for the job results API response.
+
+    Registered before navigation, so a response that arrives before the page
+    finishes loading is not missed. The wait is exposed as the page method
+    `wait_for_results`, which the request's PageMethods call in place of a
+    fixed sleep.
+    """
+    pattern = re.compile(request.meta["results_response_pattern"])
+    timeout = request.meta.get("results_response_timeout", 30000)
+    waiter = asyncio.ensure_future(
+        page.wait_for_response(lambda response: bool(pattern.search(response.url)), timeout=timeout)
+    )
+    # Retrieve the outcome even if navigation fails and nobody awaits it
+    waiter.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    async def wait_for_results():
+        response = await waiter
+        await response.finished()
+
+    page.wait_for_results = wait_for_results
@@ -0,0 +1,67 @@
+"""
+Persistent per-board crawl state for GigM8 job aggregator.
+
+Remembers, for each job board a spider fetches as one payload, the validators
+(ETag / Last-Modified) and digest of the last payload plus the `updated_at` of
+every job in it. Spiders use it to send conditional requests, skip boards that
+did not change, and emit only the jobs that did.
+"""
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from gigm8_scraper.fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlStateStore:
+    """JSON-file backed map of board name to its last crawl state.
+
+    A board's state expires `max_age` seconds after its last full crawl, after
+    which it is crawled unconditionally again; full crawls refresh
+    `last_scraped` for jobs that incremental crawls skip, so they must happen
+    well within the cleanup_old_jobs expiry window.
+    """
+
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.boards: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> "CrawlStateStore":
+        """Read the state file, starting empty if it is missing or unreadable."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self.boards = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load crawl state from {self.path}: {str(e)}")
+                self.boards = {}
+        return self
+
+    def get(self, board: str) -> Optional[Dict[str, Any]]:
+        """Return the board's state, or None when it must be crawled in full."""
+        state = self.boards.get(board)
+        if not state or time.time() - state.get("full_crawl_at", 0) > self.max_age:
+            return None
+        return state
+
+    def update(self, board: str, etag: Optional[str], last_modified: Optional[str],
+               digest: str, jobs: Dict[str, str], full: bool) -> None:
+        """Record the payload just processed for a board."""
+        previous = self.boards.get(board, {})
+        self.boards[board] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": digest,
+            "jobs": jobs,
+            "full_crawl_at": time.time() if full else previous.get("full_crawl_at", 0),
+        }
+
+    def save(self) -> None:
+        """Atomically write the state file."""
+        with atomic_write(self.path) as f:
+            json.dump(self.boards, f)
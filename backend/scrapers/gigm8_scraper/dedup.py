@@ -0,0 +1,112 @@
+"""
+Persistent deduplication index for GigM8 job aggregator.
+
+A Bloom filter over job hashes that survives between crawls, so the
+DeduplicationPipeline can tell jobs already stored in the database apart from
+new ones without querying per item. At a 1% false-positive rate it costs
+about 1.2 bytes per hash (~12 MB for 10 million jobs).
+"""
+import json
+import logging
+import math
+import struct
+import time
+from typing import Iterable
+
+from gigm8_scraper.fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GIGM8BF1"
+
+
+class BloomFilter:
+    """Bloom filter keyed by hex SHA-256 digests (such as Job.job_hash)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.num_bits = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.created_at = time.time()
+
+    def _positions(self, digest: str):
+        # The digest is already uniformly distributed: derive the k probe
+        # positions from two 64-bit slices by double hashing
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest: str) -> bool:
+        """Add a digest; returns True if it was (probably) not present before."""
+        added = False
+        for position in self._positions(digest):
+            byte, bit = divmod(position, 8)
+            mask = 1 << bit
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def update(self, digests: Iterable[str]) -> None:
+        for digest in digests:
+            self.add(digest)
+
+    def __contains__(self, digest: str) -> bool:
+        for position in self._positions(digest):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def is_saturated(self) -> bool:
+        """True once more hashes were added than the filter was sized for."""
+        return self.count > self.capacity
+
+    def save(self, path: str) -> None:
+        """Atomically write the filter to a snapshot file."""
+        header = json.dumps({
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "count": self.count,
+            "created_at": self.created_at,
+        }).encode()
+
+        with atomic_write(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack(">I", len(header)))
+            f.write(header)
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Read a filter written by save()."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a dedup index snapshot")
+            (header_size,) = struct.unpack(">I", f.read(4))
+            header = json.loads(f.read(header_size))
+            bits = bytearray(f.read())
+
+        bloom = cls.__new__(cls)
+        bloom.capacity = header["capacity"]
+        bloom.error_rate = header["error_rate"]
+        bloom.num_bits = header["num_bits"]
+        bloom.num_hashes = header["num_hashes"]
+        bloom.count = header["count"]
+        bloom.created_at = header["created_at"]
+        if len(bits) != (bloom.num_bits + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        bloom.bits = bits
+        return bloom
@@ -0,0 +1,156 @@
+"""
+Layout-aware extractors for the Greenhouse HTML fallback.
+
+Greenhouse boards come in a handful of HTML layouts. Each layout's XPath
+expressions are compiled once, and the registry remembers which card layout
+and which field variants matched for each board, so later pages (and later
+crawls, via a JSON snapshot) go straight to the right expressions instead of
+trying every selector on every card.
+"""
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from gigm8_scraper.fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+def class_contains(name: str) -> str:
+    """XPath predicate matching a whole class name, like CSS `.name`."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# Card layouts, most specific first. The generic one only takes innermost
+# matches, so it never returns a wrapper div along with the cards inside it.
+CARD_LAYOUTS = {
+    'qa_job_posting': '//div[@data-qa="job-posting"]',
+    'job_posting': f'//div[{class_contains("job-posting")}]',
+    'opening': f'//div[{class_contains("opening")}]',
+    'generic_job': '//div[contains(@class, "job")][not(.//div[contains(@class, "job")])]',
+}
+
+# Field variants relative to a card, in order of preference
+FIELD_VARIANTS = {
+    'title': [
+        './/h3//a/text()',
+        './/h4//a/text()',
+        './/a[contains(@href, "/jobs/")]/text()',
+    ],
+    'location': [
+        './/span[contains(@class, "location")]/text()',
+        './/div[contains(@class, "location")]/text()',
+    ],
+    'url': [
+        './/h3//a/@href',
+        './/h4//a/@href',
+        './/a[contains(@href, "/jobs/")]/@href',
+    ],
+}
+
+# Cards sampled when learning a board's field variants
+SAMPLE_SIZE = 5
+
+
+class ExtractorRegistry:
+    """Compiled extractors plus the layout learned for each board."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.cards = {name: etree.XPath(expression) for name, expression in CARD_LAYOUTS.items()}
+        self.fields = {
+            field: [etree.XPath(f'({expression})[1]', smart_strings=False) for expression in variants]
+            for field, variants in FIELD_VARIANTS.items()
+        }
+        self.learned: Dict[str, Dict] = {}
+        self.stats = {'reused': 0, 'learned': 0, 'relearned': 0}
+
+    def load(self) -> "ExtractorRegistry":
+        """Read the learned layouts, ignoring entries for unknown layouts."""
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    learned = json.load(f)
+                self.learned = {
+                    board: choice for board, choice in learned.items()
+                    if choice.get('cards') in self.cards and self._valid_fields(choice.get('fields'))
+                }
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Could not load extractor layouts from {self.path}: {str(e)}")
+        return self
+
+    def save(self) -> None:
+        """Atomically write the learned layouts."""
+        if not self.path:
+            return
+        with atomic_write(self.path) as f:
+            json.dump(self.learned, f)
+
+    def extract(self, board: str, root) -> List[Dict[str, Optional[str]]]:
+        """Extract title/location/url from every job card on a board page.
+
+        Returns an empty list when no known layout matches the page.
+        """
+        choice = self.learned.get(board)
+        if choice:
+            cards = self.cards[choice['cards']](root)
+            if cards and self._matches(cards, choice['fields']):
+                self.stats['reused'] += 1
+                return self._extract_cards(cards, choice['fields'])
+            self.stats['relearned'] += 1
+            logger.info(f"Layout learned for {board} no longer matches, relearning")
+        else:
+            self.stats['learned'] += 1
+
+        for layout, cards_xpath in self.cards.items():
+            cards = cards_xpath(root)
+            if not cards:
+                continue
+            fields = self._learn_fields(cards)
+            if fields is None:
+                continue
+            self.learned[board] = {'cards': layout, 'fields': fields}
+            logger.info(f"Using layout '{layout}' {fields} for {board}")
+            return self._extract_cards(cards, fields)
+        return []
+
+    def _learn_fields(self, cards) -> Optional[Dict[str, int]]:
+        """Pick, per field, the first variant that fills it on most sampled cards."""
+        sample = cards[:SAMPLE_SIZE]
+        fields = {}
+        for field, variants in self.fields.items():
+            scores = [sum(1 for card in sample if self._first(variant, card)) for variant in variants]
+            best = max(scores)
+            if not best:
+                return None
+            fields[field] = scores.index(best)
+        return fields
+
+    def _matches(self, cards, fields: Dict[str, int]) -> bool:
+        card = cards[0]
+        return all(self._first(self.fields[field][index], card) for field, index in fields.items())
+
+    def _extract_cards(self, cards, fields: Dict[str, int]) -> List[Dict[str, Optional[str]]]:
+        extractors = {field: self.fields[field][index] for field, index in fields.items()}
+        return [
+            {field: self._first(extractor, card) for field, extractor in extractors.items()}
+            for card in cards
+        ]
+
+    def _valid_fields(self, fields) -> bool:
+        return (
+            isinstance(fields, dict)
+            and set(fields) == set(self.fields)
+            and all(isinstance(index, int) and 0 <= index < len(self.fields[field]) for field, index in fields.items())
+        )
+
+    @staticmethod
+    def _first(extractor, card) -> Optional[str]:
+        for value in extractor(card):
+            value = value.strip()
+            if value:
+                return value
+        return None
@@ -0,0 +1,28 @@
+"""
+File helpers for GigM8 job aggregator spiders.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w"):
+    """Write a file through a temporary sibling that replaces `path` on success.
+
+    Readers never see a partial file; if writing fails, the temporary file
+    is removed and `path` is left as it was.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,139 @@
+"""
+Compressed single-file HTTP cache storage for GigM8 job aggregator.
+
+Keeps every cached response as one zstd-compressed row in a SQLite database
+(HTTPCACHE_DIR/cache.sqlite3) keyed by request fingerprint, instead of a
+directory tree of small files per response. Point HTTPCACHE_DIR at a volume
+shared by the worker containers to share the cache between them.
+
+Freshness is left to the cache policy: with RFC2616Policy stale entries are
+revalidated with their ETag / Last-Modified and reused on a 304. The store is
+capped at HTTPCACHE_MAX_SIZE_MB, evicting least recently used entries. The
+size is read from the database file itself, so every crawl sharing it
+enforces the cap against the same total.
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+import zstandard
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    fingerprint TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class SQLiteCacheStorage:
+    """Scrapy HTTPCACHE_STORAGE backed by one zstd-compressed SQLite file."""
+
+    def __init__(self, settings):
+        self.cache_dir = data_path(settings['HTTPCACHE_DIR'], createdir=True)
+        self.expiration_secs = settings.getint('HTTPCACHE_EXPIRATION_SECS')
+        self.max_size = settings.getint('HTTPCACHE_MAX_SIZE_MB', 1024) * 1024 * 1024
+        self.compressor = zstandard.ZstdCompressor(level=settings.getint('HTTPCACHE_ZSTD_LEVEL', 3))
+        self.decompressor = zstandard.ZstdDecompressor()
+        self.db: Optional[sqlite3.Connection] = None
+        self._fingerprinter = None
+
+    def open_spider(self, spider):
+        self._fingerprinter = spider.crawler.request_fingerprinter
+        path = os.path.join(self.cache_dir, 'cache.sqlite3')
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # WAL lets several crawls read while one writes
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        logger.debug(f"Using HTTP cache {path} ({self._used_size() / 1048576:.1f} MB)")
+
+    def close_spider(self, spider):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def retrieve_response(self, spider, request):
+        """Return the cached response for a request, or None."""
+        key = self._fingerprint(request)
+        row = self.db.execute(
+            'SELECT url, status, headers, body, stored_at FROM responses WHERE fingerprint = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, status, raw_headers, body, stored_at = row
+        now = time.time()
+        if 0 < self.expiration_secs < now - stored_at:
+            return None
+        self.db.execute('UPDATE responses SET accessed_at = ? WHERE fingerprint = ?', (now, key))
+
+        headers = Headers({name.encode('latin-1'): [value.encode('latin-1') for value in values]
+                           for name, values in json.loads(raw_headers).items()})
+        body = self.decompressor.decompress(body)
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    def store_response(self, spider, request, response):
+        """Compress and store a response, then evict down to the size cap."""
+        key = self._fingerprint(request)
+        headers = json.dumps({
+            name.decode('latin-1'): [value.decode('latin-1') for value in values]
+            for name, values in response.headers.items()
+        })
+        body = self.compressor.compress(response.body)
+        size = len(body) + len(headers) + len(response.url)
+        now = time.time()
+
+        self.db.execute(
+            'INSERT OR REPLACE INTO responses '
+            '(fingerprint, url, status, headers, body, size, stored_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, response.url, response.status, headers, body, size, now, now)
+        )
+
+        if self._used_size() > self.max_size:
+            self._evict()
+
+    def _used_size(self) -> int:
+        """Bytes of the database in use, as every connection to it sees them.
+
+        Pages freed by evictions go to the freelist and are reused, so they
+        don't count towards the cap.
+        """
+        page_count = self.db.execute('PRAGMA page_count').fetchone()[0]
+        freelist_count = self.db.execute('PRAGMA freelist_count').fetchone()[0]
+        page_size = self.db.execute('PRAGMA page_size').fetchone()[0]
+        return (page_count - freelist_count) * page_size
+
+    def _evict(self):
+        """Drop least recently used entries until the store is at 90% of its cap."""
+        target = self.max_size * 0.9
+        evicted = 0
+        while self._used_size() > target:
+            deleted = self.db.execute(
+                'DELETE FROM responses WHERE fingerprint IN '
+                '(SELECT fingerprint FROM responses ORDER BY accessed_at LIMIT 100)'
+            ).rowcount
+            if not deleted:
+                break
+            evicted += deleted
+        logger.info(f"Evicted {evicted} responses from the HTTP cache")
+
+    def _fingerprint(self, request) -> str:
+        return self._fingerprinter.fingerprint(request).hex()
@@ -31,6 +31,7 @@ class JobItem(scrapy.Item):
     # Metadata
     scraped_at = scrapy.Field()
     job_hash = scrapy.Field()
+    dedup_status = scrapy.Field()  # new or known (already stored), set by DeduplicationPipeline
     
     def __setitem__(self, key, value):
         """Override to handle data cleaning and validation."""
@@ -1,23 +1,71 @@
 """
-from scrapy.exceptions import DropItem
 Pipelines for GigM8 job aggregator.
 """
 import hashlib
 import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
+from scrapy.exceptions import DropItem
+from twisted.internet import defer, reactor, task, threads
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, func
 from models.job import Job
+from models.job_upsert import upsert_job_rows, touch_job_rows
 from models.database import settings
+from app.cache import search_cache
+from app.salary import salary_columns
+from gigm8_scraper.dedup import BloomFilter
 
 logger = logging.getLogger(__name__)
 
 class DeduplicationPipeline:
-    """Pipeline for deduplicating jobs based on hash."""
+    """Pipeline for deduplicating jobs based on hash.
+    
+    Duplicates within one crawl are dropped. Across crawls a persistent Bloom
+    filter of stored job hashes classifies each item as `new` or `known`
+    (item['dedup_status']), which lets DatabasePipeline only refresh the
+    liveness of known jobs instead of upserting them. The filter is loaded
+    from DEDUP_INDEX_PATH, rebuilt from jobs.job_hash when missing, older than
+    DEDUP_INDEX_MAX_AGE or over capacity, and saved again on close.
+    """
     
-    def __init__(self):
+    def __init__(self, index_path: str = None, max_age: float = 7 * 24 * 3600,
+                 error_rate: float = 0.01, stats=None):
         self.seen_hashes = set()
+        self.index_path = index_path
+        self.max_age = max_age
+        self.error_rate = error_rate
+        self.stats = stats
+        self.index = None
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            index_path=crawler.settings.get('DEDUP_INDEX_PATH'),
+            max_age=crawler.settings.getfloat('DEDUP_INDEX_MAX_AGE', 7 * 24 * 3600),
+            error_rate=crawler.settings.getfloat('DEDUP_INDEX_ERROR_RATE', 0.01),
+            stats=crawler.stats,
+        )
+    
+    def open_spider(self, spider):
+        """Load the persistent dedup index."""
+        if self.index_path:
+            self.index = self._load_index()
+    
+    def close_spider(self, spider):
+        """Add this crawl's hashes to the index and save it."""
+        if self.index is None:
+            return
+        self.index.update(self.seen_hashes)
+        try:
+            self.index.save(self.index_path)
+            logger.info(f"Saved dedup index with ~{len(self.index)} hashes to {self.index_path}")
+        except OSError as e:
+            logger.error(f"Could not save dedup index to {self.index_path}: {str(e)}")
     
     def process_item(self, item, spider):
         """Check if job is duplicate based on hash."""
@@ -32,78 +80,317 @@ class DeduplicationPipeline:
         
         if job_hash in self.seen_hashes:
             logger.debug(f"Duplicate job found: {title} at {company}")
+            self._inc_stat('dedup/seen_this_run')
             raise DropItem(f"Duplicate job: {title} at {company}")
         
         self.seen_hashes.add(job_hash)
         item['job_hash'] = job_hash
         item['scraped_at'] = datetime.now()
+        item['dedup_status'] = 'known' if self.index is not None and job_hash in self.index else 'new'
+        self._inc_stat(f"dedup/{item['dedup_status']}")
         
         return item
+    
+    def _load_index(self) -> BloomFilter:
+        """Load the index snapshot, rebuilding it from the database when stale."""
+        if os.path.exists(self.index_path):
+            try:
+                index = BloomFilter.load(self.index_path)
+                age = time.time() - index.created_at
+                if age <= self.max_age and not index.is_saturated:
+                    logger.info(f"Loaded dedup index with ~{len(index)} hashes from {self.index_path}")
+                    return index
+                logger.info("Dedup index snapshot is stale or saturated, rebuilding")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load dedup index from {self.index_path}: {str(e)}")
+        
+        return self._build_index_from_db()
+    
+    def _build_index_from_db(self) -> BloomFilter:
+        """Build a fresh index from jobs.job_hash, sized with room to grow."""
+        engine = create_engine(settings.database_url)
+        try:
+            with engine.connect() as connection:
+                total = connection.execute(select(func.count(Job.id))).scalar()
+                index = BloomFilter(capacity=max(total * 2, 100000), error_rate=self.error_rate)
+                result = connection.execution_options(stream_results=True, yield_per=10000).execute(
+                    select(Job.job_hash)
+                )
+                for (job_hash,) in result:
+                    index.add(job_hash)
+            logger.info(f"Built dedup index from {total} stored jobs")
+            return index
+        except Exception as e:
+            logger.error(f"Could not build dedup index from database, treating all jobs as new: {str(e)}")
+            return BloomFilter(capacity=100000, error_rate=self.error_rate)
+        finally:
+            engine.dispose()
+    
+    def _inc_stat(self, key: str, count: int = 1):
+        if self.stats:
+            self.stats.inc_value(key, count)
 
 class DatabasePipeline:
-    """Pipeline for storing jobs in database."""
+    """Pipeline for storing jobs in database.
+    
+    Items are buffered and written in batches with one
+    INSERT ... ON CONFLICT (job_hash) DO UPDATE per batch. Every row carries a
+    content fingerprint (Job.content_hash); stored jobs are only rewritten
+    when it differs, and unchanged ones just get last_scraped refreshed with
+    one UPDATE ... WHERE job_hash IN (...) per batch. For items the dedup
+    index marks as `known` the stored fingerprints are looked up first, so
+    unchanged known jobs never reach the upsert; any the lookup doesn't find
+    (Bloom filter false positives) are upserted like new ones. A batch is flushed
+    when it reaches DB_BATCH_SIZE items or DB_BATCH_INTERVAL seconds after the
+    previous flush, and on close. If a batch fails, its rows are retried one
+    at a time so only the failing rows are lost.
+    
+    All database I/O happens on a dedicated writer thread fed by a queue of
+    at most DB_WRITER_QUEUE_SIZE batches, so commits never stall the reactor.
+    When the queue is full, process_item returns a Deferred that fires once
+    the batch is queued; Scrapy waits on it, which fills the scraper slot and
+    pauses downloading until the writer catches up.
+    """
     
-    def __init__(self):
+    def __init__(self, batch_size: int = 500, batch_interval: float = 5.0,
+                 queue_size: int = 4, stats=None):
         self.engine = create_engine(settings.database_url)
         self.Session = sessionmaker(bind=self.engine)
         self.session = None
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.stats = stats
+        self.buffer: List[Dict[str, Any]] = []
+        self.known_buffer: List[Dict[str, Any]] = []
+        self.last_flush = time.monotonic()
+        self.flush_loop = None
+        self.queue = queue.Queue(maxsize=max(queue_size, 1))
+        self.writer = None
+        self.rows_written = 0
+        self.write_seconds = 0.0
+        self.max_latency = 0.0
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            batch_size=crawler.settings.getint('DB_BATCH_SIZE', 500),
+            batch_interval=crawler.settings.getfloat('DB_BATCH_INTERVAL', 5.0),
+            queue_size=crawler.settings.getint('DB_WRITER_QUEUE_SIZE', 4),
+            stats=crawler.stats,
+        )
     
     def open_spider(self, spider):
-        """Initialize database session when spider opens."""
-        self.session = self.Session()
+        """Start the writer thread when spider opens."""
+        self.last_flush = time.monotonic()
+        self.writer = threading.Thread(target=self._writer_loop, name='gigm8-db-writer', daemon=True)
+        self.writer.start()
+        if self.batch_interval > 0:
+            self.flush_loop = task.LoopingCall(self._flush_if_due)
+            self.flush_loop.start(self.batch_interval, now=False)
         logger.info("Database pipeline opened")
     
     def close_spider(self, spider):
-        """Close database session when spider closes."""
-        if self.session:
-            self.session.close()
-        logger.info("Database pipeline closed")
+        """Flush remaining items and wait for the writer to drain."""
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+        
+        def stop_writer(_):
+            return threads.deferToThread(self._stop_writer)
+        
+        def report(_):
+            if self.stats and self.write_seconds > 0:
+                self.stats.set_value('database/rows_per_second', round(self.rows_written / self.write_seconds, 1))
+            if self.stats:
+                changed = self.stats.get_value('database/rows_inserted', 0) + self.stats.get_value('database/rows_changed', 0)
+                unchanged = self.stats.get_value('database/rows_unchanged', 0)
+                logger.info(f"Crawl wrote {changed} new or changed jobs, {unchanged} unchanged")
+            logger.info("Database pipeline closed")
+        
+        d = defer.maybeDeferred(self.flush)
+        d.addCallback(stop_writer)
+        d.addCallback(report)
+        return d
     
     def process_item(self, item, spider):
-        """Store job in database."""
+        """Buffer job for the next batch write."""
+        if item.get('dedup_status') == 'known':
+            self.known_buffer.append(self._job_row(item))
+        else:
+            self.buffer.append(self._job_row(item))
+        if len(self.buffer) + len(self.known_buffer) >= self.batch_size:
+            d = self.flush()
+            if d is not None:
+                # Queue full: hold this item until the batch is accepted
+                d.addCallback(lambda _: item)
+                return d
+        return item
+    
+    def flush(self):
+        """Hand buffered jobs to the writer thread.
+        
+        Returns None when the batch was queued immediately, or a Deferred
+        that fires once the full queue had room for it.
+        """
+        self.last_flush = time.monotonic()
+        if not self.buffer and not self.known_buffer:
+            return None
+        
+        batch = (self.buffer, self.known_buffer)
+        self.buffer = []
+        self.known_buffer = []
+        
         try:
-            # Check if job already exists
-            existing_job = self.session.query(Job).filter(
-                Job.job_hash == item['job_hash']
-            ).first()
-            
-            if existing_job:
-                # Update existing job
-                existing_job.last_scraped = datetime.now()
-                existing_job.is_active = True
-                logger.debug(f"Updated existing job: {item['title']}")
-            else:
-                # Create new job
-                job = Job(
-                    title=item['title'],
-                    company=item['company'],
-                    location=item['location'],
-                    salary=item.get('salary'),
-                    description=item.get('description'),
-                    apply_url=item['apply_url'],
-                    source=item['source'],
-                    date_posted=item.get('date_posted'),
-                    job_hash=item['job_hash'],
-                    job_type=item.get('job_type'),
-                    experience_level=item.get('experience_level'),
-                    remote=item.get('remote', False),
-                    skills=','.join(item.get('skills', [])) if item.get('skills') else None,
-                    benefits=','.join(item.get('benefits', [])) if item.get('benefits') else None,
-                    industry=item.get('industry'),
-                    last_scraped=datetime.now()
-                )
-                
-                self.session.add(job)
-                logger.info(f"Added new job: {item['title']} at {item['company']}")
-            
+            self.queue.put_nowait(batch)
+            self._record_queue_depth()
+            return None
+        except queue.Full:
+            self._inc_stat('database/queue_full')
+            d = threads.deferToThread(self.queue.put, batch)
+            d.addCallback(lambda _: self._record_queue_depth())
+            return d
+    
+    def _writer_loop(self):
+        """Writer thread: own the session and write batches until stopped."""
+        self.session = self.Session()
+        try:
+            while True:
+                batch = self.queue.get()
+                if batch is None:
+                    break
+                try:
+                    self._write_batch(*batch)
+                except Exception as e:
+                    logger.error(f"Database writer failed on a batch: {str(e)}")
+                    reactor.callFromThread(self._inc_stat, 'database/batches_failed')
+        finally:
+            self.session.close()
+    
+    def _stop_writer(self):
+        if self.writer and self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+    
+    def _write_batch(self, buffered: List[Dict[str, Any]], known_buffered: List[Dict[str, Any]]):
+        """Write one batch of jobs to the database (writer thread)."""
+        # Keep the last occurrence of each hash; Postgres rejects a batch
+        # that updates the same row twice
+        rows = list({row['job_hash']: row for row in buffered}.values())
+        known = list({row['job_hash']: row for row in known_buffered}.values())
+        total = len(rows) + len(known)
+        
+        started = time.monotonic()
+        try:
+            stored = self._stored_content_hashes(known)
+            unchanged = [row for row in known if stored.get(row['job_hash'], '') == row['content_hash']]
+            pending = rows + [row for row in known if stored.get(row['job_hash'], '') != row['content_hash']]
+            touch_job_rows(self.session, unchanged)
+            inserted, changed, conflicts = upsert_job_rows(self.session, pending)
+            unchanged += conflicts
             self.session.commit()
-            
+            failed = 0
         except Exception as e:
-            logger.error(f"Error storing job {item['title']}: {str(e)}")
+            logger.warning(f"Batch write of {total} jobs failed, retrying row by row: {str(e)}")
             self.session.rollback()
-            raise
+            inserted, changed, unchanged, failed = self._upsert_rows_individually(rows + known)
+        elapsed = time.monotonic() - started
         
-        return item
+        # New and changed rows alter what searches return
+        if inserted or changed:
+            search_cache.bump_generation()
+        
+        reactor.callFromThread(self._record_batch, inserted, changed, len(unchanged), failed, elapsed)
+    
+    def _record_batch(self, inserted: int, changed: int, unchanged: int, failed: int, elapsed: float):
+        """Account for a written batch (reactor thread)."""
+        written = inserted + changed + unchanged
+        self.rows_written += written
+        self.write_seconds += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+        self._inc_stat('database/batches')
+        self._inc_stat('database/rows_written', written)
+        self._inc_stat('database/rows_inserted', inserted)
+        self._inc_stat('database/rows_changed', changed)
+        self._inc_stat('database/rows_unchanged', unchanged)
+        self._inc_stat('database/rows_failed', failed)
+        if self.stats:
+            self.stats.set_value('database/write_latency_max', round(self.max_latency, 3))
+            batches = self.stats.get_value('database/batches', 1)
+            self.stats.set_value('database/write_latency_avg', round(self.write_seconds / batches, 3))
+        self._record_queue_depth()
+        logger.info(f"Wrote {written} jobs ({inserted} new, {changed} changed, {unchanged} unchanged) in {elapsed:.2f}s")
+    
+    def _record_queue_depth(self):
+        if self.stats:
+            depth = self.queue.qsize()
+            self.stats.set_value('database/queue_depth', depth)
+            self.stats.max_value('database/queue_depth_max', depth)
+    
+    def _flush_if_due(self):
+        if time.monotonic() - self.last_flush >= self.batch_interval:
+            self.flush()
+    
+    def _stored_content_hashes(self, rows: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Map job_hash to the stored content fingerprint for active rows that exist."""
+        if not rows:
+            return {}
+        stmt = select(Job.job_hash, Job.content_hash).where(
+            Job.job_hash.in_([row['job_hash'] for row in rows]),
+            Job.is_active.is_(True)
+        )
+        return {job_hash: content_hash for job_hash, content_hash in self.session.execute(stmt)}
+    
+    def _upsert_rows_individually(self, rows: List[Dict[str, Any]]):
+        """Fallback after a failed batch: upsert each row in its own transaction."""
+        inserted = 0
+        changed = 0
+        unchanged = []
+        failed = 0
+        for row in rows:
+            try:
+                row_inserted, row_changed, row_unchanged = upsert_job_rows(self.session, [row])
+                self.session.commit()
+                inserted += row_inserted
+                changed += row_changed
+                unchanged += row_unchanged
+            except Exception as e:
+                logger.error(f"Error storing job {row['title']}: {str(e)}")
+                self.session.rollback()
+                failed += 1
+        return inserted, changed, unchanged, failed
+    
+    def _job_row(self, item) -> Dict[str, Any]:
+        """Map a scraped item to jobs table values."""
+        now = datetime.now()
+        row = {
+            'title': item['title'],
+            'company': item['company'],
+            'location': item['location'],
+            'salary': item.get('salary'),
+            **salary_columns(item.get('salary')),
+            'description': item.get('description'),
+            'apply_url': item['apply_url'],
+            'source': item['source'],
+            'date_posted': item.get('date_posted'),
+            'job_hash': item['job_hash'],
+            'job_type': item.get('job_type'),
+            'experience_level': item.get('experience_level'),
+            'remote': item.get('remote') or False,
+            'skills': ','.join(item.get('skills', [])) if item.get('skills') else None,
+            'benefits': ','.join(item.get('benefits', [])) if item.get('benefits') else None,
+            'industry': item.get('industry'),
+        }
+        row['content_hash'] = Job.generate_content_hash(row)
+        return {
+            **row,
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now,
+            'last_scraped': now,
+        }
+    
+    def _inc_stat(self, key: str, count: int = 1):
+        if self.stats:
+            self.stats.inc_value(key, count)
 
 class ValidationPipeline:
     """Pipeline for validating job data."""
@@ -0,0 +1,230 @@
+"""
+Adaptive per-host rate limiting for GigM8 job aggregator.
+
+Each host gets its own request rate instead of one global DOWNLOAD_DELAY. A
+host's rate creeps up while its responses stay fast and error-free, is cut
+sharply on 429/503 (honouring Retry-After), and is saved between runs so the
+next crawl starts at the rate the host is known to sustain.
+
+Like AutoThrottle, the rate is applied as the delay of the host's downloader
+slot, so waiting requests sit in that slot's queue rather than holding
+concurrency that other hosts could use.
+"""
+import json
+import logging
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from scrapy import signals
+
+from gigm8_scraper.fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class HostState:
+    """Request rate, Retry-After pause and health window for one host."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.paused_until = 0.0  # wall clock, like the downloader slot's lastseen
+        self.responses = 0
+        self.errors = 0
+        self.latency_total = 0.0
+
+    def reset_window(self):
+        self.responses = 0
+        self.errors = 0
+        self.latency_total = 0.0
+
+
+class AdaptiveRateLimitMiddleware:
+    """Downloader middleware pacing requests per host (AIMD on the slot delay).
+
+    Every RATE_LIMIT_WINDOW responses from a host, its rate is multiplied by
+    RATE_LIMIT_INCREASE if the error rate stayed under RATE_LIMIT_MAX_ERROR_RATE
+    and the mean latency under RATE_LIMIT_TARGET_LATENCY, or by
+    RATE_LIMIT_DECREASE if latency was too high. A 429 or 503 halves the rate
+    (RATE_LIMIT_BACKOFF) at once and pauses the host for its Retry-After.
+    Rates stay within RATE_LIMIT_MIN_RATE..RATE_LIMIT_MAX_RATE requests/second
+    and are saved to RATE_LIMIT_STATE_PATH when the spider closes.
+
+    A host's downloader slot gets a delay of 1/rate; a Retry-After pause
+    moves the slot's last download time forward, so requests already queued
+    for the host also wait it out. Only a host's very first request goes out
+    before its slot exists and can be paced.
+    """
+
+    BACKOFF_STATUSES = {429, 503}
+
+    def __init__(self, settings, stats=None, crawler=None):
+        self.start_rate = settings.getfloat('RATE_LIMIT_START_RATE', 1.0)
+        self.min_rate = settings.getfloat('RATE_LIMIT_MIN_RATE', 0.05)
+        self.max_rate = settings.getfloat('RATE_LIMIT_MAX_RATE', 20.0)
+        self.window = settings.getint('RATE_LIMIT_WINDOW', 20)
+        self.target_latency = settings.getfloat('RATE_LIMIT_TARGET_LATENCY', 2.0)
+        self.max_error_rate = settings.getfloat('RATE_LIMIT_MAX_ERROR_RATE', 0.05)
+        self.increase = settings.getfloat('RATE_LIMIT_INCREASE', 1.2)
+        self.decrease = settings.getfloat('RATE_LIMIT_DECREASE', 0.8)
+        self.backoff = settings.getfloat('RATE_LIMIT_BACKOFF', 0.5)
+        self.max_retry_after = settings.getfloat('RATE_LIMIT_MAX_RETRY_AFTER', 300)
+        self.state_path = settings.get('RATE_LIMIT_STATE_PATH')
+        self.stats = stats
+        self.crawler = crawler
+        self.hosts: Dict[str, HostState] = {}
+        self.learned: Dict[str, dict] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler.settings, stats=crawler.stats, crawler=crawler)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        """Load the per-host rates learned by earlier crawls."""
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path) as f:
+                    self.learned = {host: state for host, state in json.load(f).items() if 'rate' in state}
+                logger.info(f"Loaded learned rates for {len(self.learned)} hosts")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not load rate limit state from {self.state_path}: {str(e)}")
+
+    def spider_closed(self, spider):
+        """Save the rates learned in this crawl."""
+        for host, state in self.hosts.items():
+            if self.stats:
+                self.stats.set_value(f'ratelimit/rate/{host}', round(state.rate, 3))
+        if not self.state_path:
+            return
+
+        learned = dict(self.learned)
+        now = time.time()
+        for host, state in self.hosts.items():
+            learned[host] = {'rate': round(state.rate, 4), 'updated_at': now}
+        try:
+            with atomic_write(self.state_path) as f:
+                json.dump(learned, f)
+        except OSError as e:
+            logger.error(f"Could not save rate limit state to {self.state_path}: {str(e)}")
+
+    def process_request(self, request, spider):
+        """Apply the host's rate to its downloader slot before the request is queued there."""
+        if request.meta.get('dont_rate_limit'):
+            return None
+        self._pace(request, self._state(request.url))
+        request.meta['rate_limit_sent_at'] = time.monotonic()
+        return None
+
+    def process_response(self, request, response, spider):
+        """Adjust the host's rate from the response status and latency."""
+        sent_at = request.meta.get('rate_limit_sent_at')
+        if sent_at is None:
+            return response
+        state = self._state(request.url)
+        host = self._host(request.url)
+
+        if response.status in self.BACKOFF_STATUSES:
+            self._back_off(host, state, self._retry_after(response))
+        else:
+            self._record(host, state, self._latency(request, sent_at), error=response.status >= 500)
+        self._pace(request, state)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        """Count download errors (timeouts, refused connections) against the host."""
+        sent_at = request.meta.get('rate_limit_sent_at')
+        if sent_at is not None:
+            state = self._state(request.url)
+            self._record(self._host(request.url), state, self._latency(request, sent_at), error=True)
+            self._pace(request, state)
+        return None
+
+    def _pace(self, request, state: HostState):
+        """Set the slot delay from the host's rate, and hold the slot while the host is paused."""
+        slot = self._slot(request)
+        if slot is None:
+            return
+        slot.delay = 1.0 / state.rate
+        if state.paused_until > time.time():
+            # The downloader waits `delay` after lastseen before the next download
+            slot.lastseen = max(slot.lastseen, state.paused_until - slot.delay)
+
+    def _slot(self, request):
+        if self.crawler is None or self.crawler.engine is None:
+            return None
+        key = request.meta.get('download_slot') or self._host(request.url)
+        return self.crawler.engine.downloader.slots.get(key)
+
+    @staticmethod
+    def _latency(request, sent_at: float) -> float:
+        # download_latency leaves out the time spent queued in the slot
+        latency = request.meta.get('download_latency')
+        return latency if latency is not None else time.monotonic() - sent_at
+
+    def _record(self, host: str, state: HostState, latency: float, error: bool):
+        state.responses += 1
+        state.latency_total += latency
+        if error:
+            state.errors += 1
+        if state.responses < self.window:
+            return
+
+        error_rate = state.errors / state.responses
+        mean_latency = state.latency_total / state.responses
+        if error_rate > self.max_error_rate:
+            self._set_rate(host, state, state.rate * self.backoff)
+        elif mean_latency > self.target_latency:
+            self._set_rate(host, state, state.rate * self.decrease)
+        else:
+            self._set_rate(host, state, state.rate * self.increase)
+        state.reset_window()
+
+    def _back_off(self, host: str, state: HostState, retry_after: Optional[float]):
+        self._inc_stat('ratelimit/backoffs')
+        self._set_rate(host, state, state.rate * self.backoff)
+        if retry_after:
+            state.paused_until = max(state.paused_until, time.time() + retry_after)
+            logger.warning(f"{host} asked us to back off for {retry_after:.0f}s")
+        state.reset_window()
+
+    def _set_rate(self, host: str, state: HostState, rate: float):
+        rate = min(max(rate, self.min_rate), self.max_rate)
+        if abs(rate - state.rate) > 1e-9:
+            logger.debug(f"Rate for {host}: {state.rate:.3f} -> {rate:.3f} req/s")
+        state.rate = rate
+
+    def _retry_after(self, response) -> Optional[float]:
+        """Seconds from a Retry-After header (delta-seconds or HTTP date), capped."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        value = value.decode('latin-1').strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    def _state(self, url: str) -> HostState:
+        host = self._host(url)
+        state = self.hosts.get(host)
+        if state is None:
+            rate = self.learned.get(host, {}).get('rate', self.start_rate)
+            state = self.hosts[host] = HostState(min(max(rate, self.min_rate), self.max_rate))
+        return state
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).hostname or ''
+
+    def _inc_stat(self, key: str, count: int = 1):
+        if self.stats:
+            self.stats.inc_value(key, count)
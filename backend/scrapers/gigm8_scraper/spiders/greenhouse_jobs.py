@@ -3,12 +3,18 @@ Greenhouse Jobs Spider for GigM8 job aggregator.
 Scrapes job listings from Greenhouse-powered job boards.
 """
 import scrapy
-import json
+import hashlib
+import html
 import re
+import orjson
+import os
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 from scrapy_playwright.page import PageMethod
+from w3lib.html import remove_tags
 from gigm8_scraper.items import JobItem
+from gigm8_scraper.crawl_state import CrawlStateStore
+from gigm8_scraper.extractors import ExtractorRegistry
 
 class GreenhouseJobsSpider(scrapy.Spider):
     """Spider for Greenhouse-powered job boards."""
@@ -41,47 +47,103 @@ class GreenhouseJobsSpider(scrapy.Spider):
     ]
     
     custom_settings = {
-        'DOWNLOAD_DELAY': 1,
-        'RANDOMIZE_DOWNLOAD_DELAY': True,
         'CONCURRENT_REQUESTS': 4,
     }
     
     def start_requests(self):
-        """Generate initial requests for each company."""
+        """Generate initial requests for each company.
+        
+        Boards crawled before are requested conditionally with the validators
+        saved in the crawl state (CRAWL_STATE_DIR), so an unchanged board
+        costs a 304 instead of the full payload.
+        """
+        self.crawl_state = CrawlStateStore(
+            os.path.join(self.settings.get('CRAWL_STATE_DIR', 'crawlstate'), f'{self.name}.json'),
+            max_age=self.settings.getfloat('CRAWL_STATE_MAX_AGE', 7 * 24 * 3600),
+        ).load()
+        self.extractors = ExtractorRegistry(
+            os.path.join(self.settings.get('CRAWL_STATE_DIR', 'crawlstate'), f'{self.name}_layouts.json')
+        ).load()
+        
         for company in self.companies:
             # Try both API and web scraping approaches
-            api_url = f'https://boards-api.greenhouse.io/v1/boards/{company}/jobs'
+            # content=true returns descriptions and departments in the same payload
+            api_url = f'https://boards-api.greenhouse.io/v1/boards/{company}/jobs?content=true'
             web_url = f'https://boards.greenhouse.io/{company}'
             
+            board_state = self.crawl_state.get(company)
+            headers = {}
+            if board_state:
+                if board_state.get('etag'):
+                    headers['If-None-Match'] = board_state['etag']
+                if board_state.get('last_modified'):
+                    headers['If-Modified-Since'] = board_state['last_modified']
+            
             # First try API approach
             yield scrapy.Request(
                 url=api_url,
                 callback=self.parse_api,
-                meta={'company': company},
+                headers=headers,
+                meta={
+                    'company': company,
+                    'board_state': board_state,
+                    'handle_httpstatus_list': [304],
+                },
                 errback=self.api_fallback,
                 dont_filter=True
             )
     
     def parse_api(self, response):
-        """Parse Greenhouse API response."""
+        """Parse Greenhouse API response, emitting only new or updated jobs."""
         company = response.meta['company']
+        board_state = response.meta.get('board_state')
+        
+        if response.status == 304:
+            self.logger.info(f"Board for {company} not modified, skipping")
+            self.crawler.stats.inc_value('greenhouse/boards_not_modified')
+            return
+        
+        digest = hashlib.sha256(response.body).hexdigest()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        etag = etag.decode() if etag else None
+        last_modified = last_modified.decode() if last_modified else None
+        
+        if board_state and board_state.get('digest') == digest:
+            self.logger.info(f"Board for {company} unchanged, skipping")
+            self.crawler.stats.inc_value('greenhouse/boards_unchanged')
+            self.crawl_state.update(company, etag, last_modified, digest, board_state['jobs'], full=False)
+            return
         
         try:
-            data = json.loads(response.text)
+            # Boards with descriptions run to megabytes; orjson parses the raw bytes directly
+            data = orjson.loads(response.body)
             jobs = data.get('jobs', [])
             
             self.logger.info(f"Found {len(jobs)} jobs for {company} via API")
+            self.crawler.stats.inc_value('greenhouse/boards_changed')
             
+            seen_updates = board_state['jobs'] if board_state else {}
+            job_updates = {}
             for job_data in jobs:
+                job_id = str(job_data.get('id'))
+                job_updates[job_id] = job_data.get('updated_at') or ''
+                if job_id in seen_updates and seen_updates[job_id] == job_updates[job_id]:
+                    self.crawler.stats.inc_value('greenhouse/jobs_unchanged')
+                    continue
+                
                 try:
                     job_item = self.extract_job_from_api(job_data, company)
                     if job_item:
+                        self.crawler.stats.inc_value('greenhouse/jobs_emitted')
                         yield job_item
                 except Exception as e:
                     self.logger.error(f"Error extracting job from API for {company}: {str(e)}")
                     continue
+            
+            self.crawl_state.update(company, etag, last_modified, digest, job_updates, full=board_state is None)
                     
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             self.logger.warning(f"Failed to parse JSON for {company}, trying web scraping")
             # Fallback to web scraping
             web_url = f'https://boards.greenhouse.io/{company}'
@@ -98,8 +160,8 @@ class GreenhouseJobsSpider(scrapy.Spider):
         
         self.logger.info(f"Parsing web page for {company}: {response.url}")
         
-        # Look for job listings in various formats
-        job_cards = response.css('div[data-qa="job-posting"]') or response.css('div.job-posting') or response.css('div[class*="job"]')
+        # Job cards, extracted with the layout learned for this board
+        job_cards = self.extractors.extract(company, response.selector.root)
         
         if not job_cards:
             # Try to find job links
@@ -145,6 +207,11 @@ class GreenhouseJobsSpider(scrapy.Spider):
             # Check if remote
             remote = 'remote' in location.lower() or 'work from home' in location.lower()
             
+            description = self.html_to_text(job_data.get('content'))
+            departments = [department.get('name') for department in job_data.get('departments') or [] if department.get('name')]
+            if departments and description:
+                description = f"Department: {', '.join(departments)}\n\n{description}"
+            
             # Extract posted date
             date_posted = job_data.get('updated_at')
             if date_posted:
@@ -160,6 +227,7 @@ class GreenhouseJobsSpider(scrapy.Spider):
                     location=location.strip(),
                     apply_url=apply_url.strip(),
                     source=f"Greenhouse ({company.title()})",
+                    description=description,
                     job_type=job_type.strip() if job_type else None,
                     experience_level=experience_level.strip() if experience_level else None,
                     remote=remote,
@@ -171,12 +239,22 @@ class GreenhouseJobsSpider(scrapy.Spider):
             self.logger.error(f"Error extracting job from API: {str(e)}")
             return None
     
+    @staticmethod
+    def html_to_text(content):
+        """Turn the entity-escaped HTML of a job's `content` into plain text."""
+        if not content:
+            return None
+        text = remove_tags(html.unescape(content).replace('</p>', '\n').replace('<br>', '\n').replace('</li>', '\n'))
+        text = html.unescape(text)
+        lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in text.splitlines())
+        return '\n'.join(line for line in lines if line) or None
+    
     def extract_job_from_web(self, card, company, response):
-        """Extract job data from web page."""
+        """Build a job from the fields extracted from a web job card."""
         try:
-            title = card.css('h3 a::text').get() or card.css('h4 a::text').get() or card.css('a[href*="/jobs/"]::text').get()
-            location = card.css('span[class*="location"]::text').get() or card.css('div[class*="location"]::text').get()
-            apply_url = card.css('h3 a::attr(href)').get() or card.css('h4 a::attr(href)').get() or card.css('a[href*="/jobs/"]::attr(href)').get()
+            title = card.get('title')
+            location = card.get('location')
+            apply_url = card.get('url')
             
             if apply_url:
                 apply_url = urljoin(response.url, apply_url)
@@ -242,3 +320,26 @@ class GreenhouseJobsSpider(scrapy.Spider):
         """Fallback when job detail parsing fails."""
         company = failure.request.meta['company']
         self.logger.error(f"Job detail parsing failed for {company}: {failure.value}")
+    
+    def closed(self, reason):
+        """Persist the crawl state, unless the crawl was cut short or jobs were not stored.
+        
+        The state marks every emitted job as seen, so it is only saved when
+        DatabasePipeline (closed before this runs) reports no failed writes;
+        otherwise the next crawl emits those jobs again.
+        """
+        if reason != 'finished':
+            self.logger.warning(f"Crawl ended with '{reason}', not saving crawl state")
+            return
+        stats = self.crawler.stats
+        for key, value in self.extractors.stats.items():
+            stats.set_value(f'greenhouse/layouts_{key}', value)
+        failed = stats.get_value('database/rows_failed', 0) + stats.get_value('database/batches_failed', 0)
+        try:
+            if failed:
+                self.logger.warning(f"{failed} database writes failed, not saving crawl state")
+            else:
+                self.crawl_state.save()
+            self.extractors.save()
+        except OSError as e:
+            self.logger.error(f"Could not save crawl state: {str(e)}")
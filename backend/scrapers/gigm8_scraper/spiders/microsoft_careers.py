@@ -5,43 +5,171 @@ Scrapes job listings from Microsoft's careers website.
 import scrapy
 import json
 import re
+import resource
+import time
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlencode
 from scrapy_playwright.page import PageMethod
 from gigm8_scraper.items import JobItem
+from gigm8_scraper.browser import ContextPool, expect_results_response
 
 class MicrosoftCareersSpider(scrapy.Spider):
-    """Spider for Microsoft careers page."""
+    """Spider for Microsoft careers page.
+    
+    By default jobs are read straight from the JSON search API the careers
+    page itself calls, paginated with plain HTTP requests. The browser path
+    (rendering search-results pages in Playwright) is only used when the API
+    fails, or when run with `-a mode=browser`.
+    """
     
     name = 'microsoft_careers'
     allowed_domains = ['careers.microsoft.com']
     start_urls = ['https://careers.microsoft.com/us/en/search-results']
     
+    # Search API call whose response carries the job cards
+    results_response_pattern = r'/search/api/v1/search|/widgets'
+    
+    api_url = 'https://gcsservices.careers.microsoft.com/search/api/v1/search'
+    api_page_size = 20
+    api_max_pages = 500
+    job_url = 'https://jobs.careers.microsoft.com/global/en/job/{job_id}'
+    
     custom_settings = {
-        'DOWNLOAD_DELAY': 2,
-        'RANDOMIZE_DOWNLOAD_DELAY': True,
         'CONCURRENT_REQUESTS': 8,
     }
     
+    def __init__(self, mode='api', *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+        self.api_ok = False
+        self.browser_started = False
+    
     def start_requests(self):
         """Generate initial requests."""
+        self.started_at = time.monotonic()
+        self.context_pool = ContextPool(sorted(self.settings.getdict('PLAYWRIGHT_CONTEXTS')) or ['default'])
+        if self.mode == 'browser':
+            yield from self.browser_requests()
+        else:
+            yield self.api_page_request(1)
+    
+    def browser_requests(self):
+        """Start the Playwright path (once)."""
+        if self.browser_started:
+            return
+        self.browser_started = True
         for url in self.start_urls:
-            yield scrapy.Request(
-                url=url,
-                callback=self.parse,
-                meta={
-                    'playwright': True,
-                    'playwright_page_methods': [
-                        PageMethod('wait_for_selector', 'div[data-automation-id="job-card"]', timeout=30000),
-                        PageMethod('evaluate', 'window.scrollTo(0, document.body.scrollHeight)'),
-                        PageMethod('wait_for_timeout', 3000),
-                    ]
-                }
-            )
+            yield self.results_page_request(url)
+    
+    def api_page_request(self, page):
+        """Request one page of the JSON search API."""
+        params = urlencode({'l': 'en_us', 'pg': page, 'pgSz': self.api_page_size, 'o': 'Recent', 'flt': 'true'})
+        return scrapy.Request(
+            url=f'{self.api_url}?{params}',
+            callback=self.parse_api,
+            headers={'Accept': 'application/json'},
+            meta={'api_page': page},
+            errback=self.api_fallback,
+        )
+    
+    def parse_api(self, response):
+        """Parse a page of the JSON search API."""
+        page = response.meta['api_page']
+        try:
+            result = json.loads(response.text)['operationResult']['result']
+            jobs = result['jobs']
+            total = int(result.get('totalJobs') or 0)
+        except (ValueError, KeyError, TypeError) as e:
+            yield from self.fall_back_to_browser(f"unexpected search API response on page {page}: {str(e)}")
+            return
+        
+        self.api_ok = True
+        self.crawler.stats.inc_value('microsoft/api_pages')
+        self.logger.info(f"Search API page {page}: {len(jobs)} of {total} jobs")
+        
+        for job_data in jobs:
+            try:
+                job_item = self.extract_job_from_api(job_data)
+                if job_item:
+                    yield job_item
+            except Exception as e:
+                self.logger.error(f"Error extracting job from search API: {str(e)}")
+                continue
+        
+        # The first page tells us how many there are; request the rest at once
+        if page == 1 and total:
+            last_page = min((total + self.api_page_size - 1) // self.api_page_size, self.api_max_pages)
+            for next_page in range(2, last_page + 1):
+                yield self.api_page_request(next_page)
+    
+    def api_fallback(self, failure):
+        """Fall back to rendering pages when the search API is unusable."""
+        page = failure.request.meta['api_page']
+        yield from self.fall_back_to_browser(f"search API request for page {page} failed: {failure.value}")
+    
+    def fall_back_to_browser(self, reason):
+        if self.api_ok:
+            # The API works; a single bad page is not worth a browser crawl
+            self.logger.error(f"Skipping page: {reason}")
+            return
+        self.logger.warning(f"Falling back to browser rendering: {reason}")
+        self.crawler.stats.set_value('microsoft/browser_fallback', reason)
+        yield from self.browser_requests()
+    
+    def extract_job_from_api(self, job_data):
+        """Map a search API job to a JobItem."""
+        properties = job_data.get('properties') or {}
+        title = job_data.get('title')
+        job_id = job_data.get('jobId')
+        location = properties.get('primaryLocation') or next(iter(properties.get('locations') or []), None)
+        if not (title and job_id and location):
+            return None
+        
+        flexibility = (properties.get('workSiteFlexibility') or '').lower()
+        remote = 'remote' in location.lower() or '100% work from home' in flexibility
+        
+        date_posted = job_data.get('postingDate')
+        if date_posted:
+            try:
+                date_posted = datetime.fromisoformat(date_posted.replace('Z', '+00:00'))
+            except ValueError:
+                date_posted = None
+        
+        job_type = properties.get('employmentType') or properties.get('jobType')
+        return JobItem(
+            title=title.strip(),
+            company="Microsoft",
+            location=location.strip(),
+            apply_url=self.job_url.format(job_id=job_id),
+            source="Microsoft Careers",
+            description=properties.get('description'),
+            job_type=job_type.strip() if job_type else None,
+            remote=remote,
+            date_posted=date_posted,
+            industry="Technology"
+        )
+    
+    def results_page_request(self, url):
+        """Render a search-results page, waiting for the job data instead of a fixed delay."""
+        return scrapy.Request(
+            url=url,
+            callback=self.parse,
+            meta={
+                'playwright': True,
+                'playwright_context': self.context_pool.next(),
+                'playwright_page_init_callback': expect_results_response,
+                'results_response_pattern': self.results_response_pattern,
+                'playwright_page_methods': [
+                    PageMethod('wait_for_results'),
+                    PageMethod('wait_for_selector', 'div[data-automation-id="job-card"]', timeout=30000),
+                ]
+            }
+        )
     
     def parse(self, response):
         """Parse the main careers page."""
         self.logger.info(f"Parsing Microsoft careers page: {response.url}")
+        self.crawler.stats.inc_value('microsoft/pages_rendered')
         
         # Extract job cards
         job_cards = response.css('div[data-automation-id="job-card"]')
@@ -56,22 +184,24 @@ class MicrosoftCareersSpider(scrapy.Spider):
                 self.logger.error(f"Error extracting job data: {str(e)}")
                 continue
         
-        # Check for pagination
-        next_page = response.css('a[data-automation-id="pagination-next"]::attr(href)').get()
-        if next_page:
-            next_url = urljoin(response.url, next_page)
-            yield scrapy.Request(
-                url=next_url,
-                callback=self.parse,
-                meta={
-                    'playwright': True,
-                    'playwright_page_methods': [
-                        PageMethod('wait_for_selector', 'div[data-automation-id="job-card"]', timeout=30000),
-                        PageMethod('evaluate', 'window.scrollTo(0, document.body.scrollHeight)'),
-                        PageMethod('wait_for_timeout', 3000),
-                    ]
-                }
-            )
+        # Queue every results page linked from the pagination bar, not just
+        # the next one, so several pages render at once (the dupe filter
+        # drops pages already queued)
+        page_links = response.css('a[data-automation-id^="pagination"]::attr(href)').getall()
+        for page_link in page_links:
+            yield self.results_page_request(urljoin(response.url, page_link))
+    
+    def closed(self, reason):
+        """Report rendering throughput for the crawl."""
+        stats = self.crawler.stats
+        elapsed = time.monotonic() - self.started_at
+        pages = stats.get_value('microsoft/pages_rendered', 0)
+        if elapsed > 0:
+            stats.set_value('microsoft/pages_per_minute', round(pages * 60 / elapsed, 1))
+        # Peak RSS of this process and of the (exited) browser processes
+        stats.set_value('microsoft/peak_rss_mb', round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1))
+        stats.set_value('microsoft/browser_peak_rss_mb',
+                        round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1))
     
     def extract_job_data(self, card, response):
         """Extract job data from a job card."""
@@ -0,0 +1,112 @@
+"""
+Tests for the streaming bulk ingest parsers.
+"""
+import asyncio
+import json
+import random
+
+import pytest
+
+from app import bulk
+from app.bulk import RecordError, iter_json_array, iter_ndjson
+
+RECORDS = [
+    {"title": "Engineer", "salary": 1.5, "score": -2.25e-3, "big": 6E+10, "n": 0},
+    {"remote": True, "benefits": None, "skills": ["py", "sql"], "flag": False},
+    {"location": "Zürich – \"HQ\"", "escaped": "tab\tnew\\nline \\u00e9", "count": 12345},
+    [1.0, 2, -3.5e2],
+    7.25,
+]
+
+
+def collect(parser, body: bytes, splits):
+    """Run a parser over `body` cut at the given offsets; returns records, or the RecordError."""
+    async def chunks():
+        previous = 0
+        for offset in list(splits) + [len(body)]:
+            yield body[previous:offset]
+            previous = offset
+
+    async def run():
+        return [record async for _, record in parser(chunks())]
+
+    try:
+        return asyncio.run(run())
+    except RecordError as e:
+        return e
+
+
+@pytest.mark.parametrize("parser, body", [
+    (iter_json_array, json.dumps(RECORDS).encode()),
+    (iter_json_array, json.dumps(RECORDS, indent=2, ensure_ascii=False).encode()),
+    (iter_ndjson, b"\n".join(json.dumps(record, ensure_ascii=False).encode() for record in RECORDS) + b"\n"),
+])
+def test_every_single_split_parses_the_same(parser, body):
+    for offset in range(len(body) + 1):
+        assert collect(parser, body, [offset]) == RECORDS, f"split at {offset}"
+
+
+def test_random_chunking_parses_the_same():
+    body = json.dumps(RECORDS * 20).encode()
+    rng = random.Random(1234)
+    for _ in range(300):
+        splits = sorted(rng.sample(range(1, len(body)), rng.randint(1, 60)))
+        assert collect(iter_json_array, body, splits) == RECORDS * 20
+
+
+@pytest.mark.parametrize("body", [b"[]", b" [ ] ", b"[\n]"])
+def test_empty_array(body):
+    assert collect(iter_json_array, body, []) == []
+
+
+@pytest.mark.parametrize("body, message", [
+    (b'[,{"a": 1}]', "Empty element"),
+    (b'[{"a": 1},,{"b": 2}]', "Empty element"),
+    (b'[{"a": 1},]', "Empty element"),
+    (b'[{"a": 1} {"b": 2}]', "Expected ','"),
+    (b'[{"a": 1}', "Unexpected end"),
+    (b'{"a": 1}', "must be a JSON array"),
+])
+def test_malformed_arrays_are_fatal(body, message):
+    result = collect(iter_json_array, body, [])
+    assert isinstance(result, RecordError) and message in str(result)
+
+
+def test_bad_element_fails_without_reading_the_rest():
+    read = []
+
+    async def chunks():
+        yield b'[{"a": 1}, {"a": bad}, '
+        for _ in range(1000):
+            read.append(1)
+            yield b'{"x": 1}, '
+        yield b"]"
+
+    async def run():
+        return [record async for _, record in iter_json_array(chunks())]
+
+    with pytest.raises(RecordError, match="element 1"):
+        asyncio.run(run())
+    assert len(read) <= 1
+
+
+def test_oversized_element_is_rejected(monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_ELEMENT_CHARS", 100)
+    body = b'[{"a": "' + b"x" * 500 + b'"}]'
+    result = collect(iter_json_array, body, range(10, len(body), 10))
+    assert isinstance(result, RecordError) and "larger than" in str(result)
+
+
+def test_ndjson_reports_bad_lines_and_keeps_going():
+    body = b'{"a": 1}\nnot json\n\n{"b": 2}'
+    result = collect(iter_ndjson, body, [3, 12])
+    assert result[0] == {"a": 1} and result[2] == {"b": 2}
+    assert isinstance(result[1], RecordError)
+
+
+def test_ndjson_oversized_line_is_skipped(monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_ELEMENT_CHARS", 100)
+    body = b'{"a": 1}\n{"big": "' + b"x" * 500 + b'"}\n{"b": 2}\n'
+    result = collect(iter_ndjson, body, range(7, len(body), 7))
+    assert result[0] == {"a": 1} and result[2] == {"b": 2}
+    assert isinstance(result[1], RecordError) and "larger than" in str(result[1])
@@ -0,0 +1,27 @@
+"""
+Tests for keyset pagination cursors.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    posted = datetime(2026, 3, 1, 12, 30)
+    cursor = encode_cursor("posted_date", "DESC", posted, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"s": "posted_date", "o": "desc", "k": posted.isoformat(), "id": 42}
+
+
+def test_cursor_keeps_null_and_numeric_keys():
+    assert decode_cursor(encode_cursor("salary_max", "asc", None, 7))["k"] is None
+    assert decode_cursor(encode_cursor("salary_max", "asc", 150000, 7))["k"] == 150000
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", "WzEsMl0", "eyJpZCI6ICJ4In0"])
+def test_garbage_cursors_are_rejected(cursor):
+    # e30 is {}, WzEsMl0 is [1,2] and eyJpZCI6ICJ4In0 is {"id": "x"}
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,63 @@
+"""
+Tests for the scraper's Bloom filter dedup index.
+"""
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scrapers"))
+
+from gigm8_scraper.dedup import BloomFilter  # noqa: E402
+
+
+def digests(prefix, count):
+    return [hashlib.sha256(f"{prefix}-{i}".encode()).hexdigest() for i in range(count)]
+
+
+def test_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    added = digests("seen", 2000)
+    bloom.update(added)
+
+    assert all(digest in bloom for digest in added)
+    false_positives = sum(digest in bloom for digest in digests("unseen", 5000))
+    assert false_positives < 5000 * 0.03
+    assert not bloom.is_saturated
+
+
+def test_add_reports_new_digests():
+    bloom = BloomFilter(capacity=100)
+    digest = digests("job", 1)[0]
+    assert bloom.add(digest) is True
+    assert bloom.add(digest) is False
+    assert len(bloom) == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    bloom = BloomFilter(capacity=500, error_rate=0.001)
+    bloom.update(digests("job", 300))
+    path = tmp_path / "index" / "jobs.bloom"
+    bloom.save(str(path))
+
+    loaded = BloomFilter.load(str(path))
+    assert (loaded.num_bits, loaded.num_hashes, len(loaded)) == (bloom.num_bits, bloom.num_hashes, 300)
+    assert loaded.bits == bloom.bits
+    assert all(digest in loaded for digest in digests("job", 300))
+    assert os.listdir(path.parent) == ["jobs.bloom"]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "jobs.bloom"
+    path.write_bytes(b"NOTABLOOM")
+    with pytest.raises(ValueError, match="not a dedup index"):
+        BloomFilter.load(str(path))
+
+
+def test_load_rejects_truncated_snapshot(tmp_path):
+    path = tmp_path / "jobs.bloom"
+    BloomFilter(capacity=100).save(str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        BloomFilter.load(str(path))
@@ -0,0 +1,98 @@
+"""
+Tests for the adaptive per-host rate limiter.
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("scrapy")
+
+from scrapy.core.downloader import Slot  # noqa: E402
+from scrapy.http import Request, Response  # noqa: E402
+from scrapy.settings import Settings  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scrapers"))
+
+from gigm8_scraper.ratelimit import AdaptiveRateLimitMiddleware  # noqa: E402
+
+HOST = "boards-api.greenhouse.io"
+
+
+def make_middleware(tmp_path, **overrides):
+    settings = Settings({
+        "RATE_LIMIT_START_RATE": 2.0,
+        "RATE_LIMIT_WINDOW": 4,
+        "RATE_LIMIT_STATE_PATH": str(tmp_path / "hosts.json"),
+        **overrides,
+    })
+    slots = {}
+    crawler = SimpleNamespace(engine=SimpleNamespace(downloader=SimpleNamespace(slots=slots)))
+    return AdaptiveRateLimitMiddleware(settings, crawler=crawler), slots
+
+
+def round_trip(middleware, status=200, headers=None, latency=0.1, url=f"https://{HOST}/v1/boards/x/jobs"):
+    request = Request(url)
+    assert middleware.process_request(request, None) is None
+    request.meta["download_latency"] = latency
+    response = Response(url, status=status, headers=headers or {})
+    return middleware.process_response(request, response, None)
+
+
+def test_process_request_does_not_wait_and_sets_the_slot_delay(tmp_path):
+    middleware, slots = make_middleware(tmp_path)
+    slots[HOST] = Slot(concurrency=8, delay=0, randomize_delay=False)
+
+    started = time.monotonic()
+    for _ in range(10):
+        middleware.process_request(Request(f"https://{HOST}/jobs"), None)
+    assert time.monotonic() - started < 0.1
+    assert slots[HOST].delay == pytest.approx(0.5)
+
+
+def test_rate_rises_with_healthy_responses_and_falls_with_slow_ones(tmp_path):
+    middleware, slots = make_middleware(tmp_path)
+    slots[HOST] = Slot(concurrency=8, delay=0, randomize_delay=False)
+
+    for _ in range(4):
+        round_trip(middleware, latency=0.1)
+    assert middleware.hosts[HOST].rate == pytest.approx(2.4)
+    assert slots[HOST].delay == pytest.approx(1 / 2.4)
+
+    for _ in range(4):
+        round_trip(middleware, latency=5.0)
+    assert middleware.hosts[HOST].rate == pytest.approx(2.4 * 0.8)
+
+
+def test_retry_after_pauses_the_slot_and_backs_off(tmp_path):
+    middleware, slots = make_middleware(tmp_path)
+    slot = slots[HOST] = Slot(concurrency=8, delay=0, randomize_delay=False)
+
+    round_trip(middleware, status=429, headers={"Retry-After": "30"})
+    assert middleware.hosts[HOST].rate == pytest.approx(1.0)
+    # The next download from this slot waits until the pause is over
+    assert slot.lastseen + slot.delay == pytest.approx(time.time() + 30, abs=1)
+
+
+def test_other_hosts_are_not_affected_by_a_pause(tmp_path):
+    middleware, slots = make_middleware(tmp_path)
+    slots[HOST] = Slot(concurrency=8, delay=0, randomize_delay=False)
+    other = slots["example.com"] = Slot(concurrency=8, delay=0, randomize_delay=False)
+
+    round_trip(middleware, status=503, headers={"Retry-After": "60"})
+    middleware.process_request(Request("https://example.com/jobs"), None)
+    assert other.lastseen == 0
+    assert other.delay == pytest.approx(0.5)
+
+
+def test_learned_rates_are_saved_and_reloaded(tmp_path):
+    middleware, slots = make_middleware(tmp_path)
+    for _ in range(4):
+        round_trip(middleware)
+    middleware.spider_closed(None)
+
+    reloaded, _ = make_middleware(tmp_path)
+    reloaded.spider_opened(None)
+    assert reloaded._state(f"https://{HOST}/").rate == pytest.approx(2.4)
@@ -0,0 +1,33 @@
+"""
+Tests for salary string parsing.
+"""
+from app.salary import parse_salary
+
+
+def test_401k_is_not_a_salary_amount():
+    parsed = parse_salary("401k, $90,000")
+    assert (parsed.min_annual, parsed.max_annual, parsed.currency) == (90000, 90000, "USD")
+
+
+def test_k_amounts_with_currency_or_in_a_range():
+    assert parse_salary("$120k - $160k").to_columns() == {
+        "salary_min_annual": 120000, "salary_max_annual": 160000, "salary_currency": "USD",
+    }
+    assert (parse_salary("120k-160k").min_annual, parse_salary("120k-160k").max_annual) == (120000, 160000)
+    assert parse_salary("45k EUR").min_annual == 45000
+
+
+def test_bare_k_number_is_ignored():
+    assert parse_salary("120K") is None
+
+
+def test_unmarked_numbers_are_ignored_next_to_a_currency_amount():
+    parsed = parse_salary("$45/hour, 40 hours per week")
+    assert (parsed.min_annual, parsed.max_annual, parsed.period) == (93600, 93600, "hour")
+    parsed = parse_salary("2 years experience, $90k")
+    assert (parsed.min_annual, parsed.max_annual) == (90000, 90000)
+
+
+def test_unmarked_end_of_a_marked_range_still_counts():
+    parsed = parse_salary("$120,000 - 150,000 per year")
+    assert (parsed.min_annual, parsed.max_annual) == (120000, 150000)